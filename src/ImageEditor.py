@@ -1,8 +1,8 @@
 from PyQt5.QtWidgets import (QMainWindow, QGraphicsView, QGraphicsScene,
                              QToolBar, QDockWidget, QWidget, QVBoxLayout,
                              QStackedWidget, QAction, QMenu, QFileDialog, QMessageBox,
-                             QGraphicsPixmapItem)
-from PyQt5.QtCore import Qt
+                             QGraphicsPixmapItem, QApplication, QProgressBar, QPushButton)
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QIcon, QColor, QKeySequence, QPixmap, QImage
 
 from src.core.document import Document
@@ -10,6 +10,8 @@ from src.core.action_orchestrator import ActionOrchestrator
 from src.ui.filter_manager import FilterManager
 from src.ui.color_picker_widget import ColorPickerWidget
 from src.ui.canvas_view import CanvasView
+from src.ui.filter_chain_widget import FilterChainWidget
+from src.ui.filter_preview import FilterPreview
 
 from src.tools.brush_tool import BrushTool
 from src.tools.eraser_tool import EraserTool
@@ -27,6 +29,9 @@ from src.filters.hue_saturation_filter import HueSaturationFilter
 from src.filters.invert_filter import InvertFilter
 from src.filters.grayscale_filter import GrayscaleFilter
 from src.commands.filter_command import FilterCommand
+from src.core.filter_runner import FilterRunner
+from src.core import tile_scheduler
+from src.core import pixel_buffer
 from PyQt5.QtCore import QRectF
 
 
@@ -40,6 +45,11 @@ class ImageEditor(QMainWindow):
         self.document = Document()
         self.orchestrator = ActionOrchestrator()
         self.filter_manager = FilterManager()
+        self.filter_runner = FilterRunner(parent=self)
+        self.filter_runner.progress.connect(self.on_filter_progress)
+        self.filter_runner.finished.connect(self.on_filter_finished)
+        self.filter_runner.failed.connect(self.on_filter_failed)
+        self.filter_runner.cancelled.connect(self.on_filter_cancelled)
 
         self.setup_central_widget()
         self.setup_tools()
@@ -52,6 +62,7 @@ class ImageEditor(QMainWindow):
     def setup_central_widget(self):
         self.view = CanvasView(self.document, self.orchestrator)
         self.setCentralWidget(self.view)
+        self.filter_preview = FilterPreview(self.view, self.document)
 
     def setup_tools(self):
         tools = [
@@ -63,8 +74,8 @@ class ImageEditor(QMainWindow):
             ShapeTool("rectangle", self.choose_color, self.current_color),
             ShapeTool("circle", self.choose_color, self.current_color),
             ShapeTool("line", self.choose_color, self.current_color),
-            TextTool(self.choose_color, self.current_color),
-            ColorPickerTool(),
+            TextTool(self.choose_color, self.current_color, self.execute_command),
+            ColorPickerTool(self.on_color_picked),
             ZoomTool(self)
         ]
 
@@ -92,6 +103,7 @@ class ImageEditor(QMainWindow):
         self.setup_left_toolbar()
         self.setup_right_dock()
         self.setup_top_toolbar()
+        self.setup_status_bar()
 
     def setup_left_toolbar(self):
         self.left_toolbar = QToolBar("Drawing Tools")
@@ -176,6 +188,10 @@ class ImageEditor(QMainWindow):
             self.filter_panel_indices[filter_obj.get_filter_name()] = index
 
         main_layout.addWidget(self.options_stack)
+
+        self.filter_chain_widget = FilterChainWidget()
+        self.filter_chain_widget.set_apply_callback(self.apply_filter_chain)
+        main_layout.addWidget(self.filter_chain_widget)
         main_layout.addStretch()
 
         self.color_picker_widget = ColorPickerWidget(self.current_color)
@@ -221,6 +237,17 @@ class ImageEditor(QMainWindow):
         self.left_toolbar.visibilityChanged.connect(self.sync_left_toolbar_button)
         self.right_dock.visibilityChanged.connect(self.sync_right_dock_button)
 
+    def setup_status_bar(self):
+        self.filter_progress = QProgressBar()
+        self.filter_progress.setMaximumWidth(200)
+        self.filter_progress.setRange(0, 100)
+        self.filter_cancel_btn = QPushButton("Cancel")
+        self.filter_cancel_btn.clicked.connect(self.filter_runner.cancel_all)
+
+        self.statusBar().addPermanentWidget(self.filter_progress)
+        self.statusBar().addPermanentWidget(self.filter_cancel_btn)
+        self.set_filter_busy(False)
+
     def toggle_left_toolbar_visibility(self):
         self.left_toolbar.setVisible(not self.left_toolbar.isVisible())
 
@@ -319,15 +346,30 @@ class ImageEditor(QMainWindow):
         toggle_top_toolbar_action.setText("Toggle Panel Buttons")
         view_menu.addAction(toggle_top_toolbar_action)
     
+    def execute_command(self, command):
+        """Execute a command a tool created outside of a mouse release."""
+        self.document.execute_command(command)
+        self.update_undo_redo_states()
+
+    def finish_text_editing(self):
+        """Close open text edits so they land in the history before it is walked."""
+        for tool in self.orchestrator.get_actions():
+            if hasattr(tool, 'finish_editing'):
+                tool.finish_editing()
+
     def perform_undo(self):
         """Perform undo operation."""
+        self.finish_text_editing()
         if self.document.undo():
+            self.filter_preview.invalidate()
             self.update_undo_redo_states()
             self.view.viewport().update()
     
     def perform_redo(self):
         """Perform redo operation."""
+        self.finish_text_editing()
         if self.document.redo():
+            self.filter_preview.invalidate()
             self.update_undo_redo_states()
             self.view.viewport().update()
     
@@ -356,6 +398,8 @@ class ImageEditor(QMainWindow):
 
         for filter_obj in self.filter_manager.get_filters():
             filter_obj.get_action().setChecked(False)
+        self.filter_chain_widget.set_current_filter(None)
+        self.filter_preview.cancel()
 
         self.color_picker_widget.auto_show_for_tool(tool_name)
 
@@ -367,8 +411,12 @@ class ImageEditor(QMainWindow):
         if settings_widget:
             self.options_stack.addWidget(settings_widget)
             self.options_stack.setCurrentWidget(settings_widget)
+
+        self.filter_chain_widget.set_current_filter(filter_obj)
+        self.filter_preview.cancel()
+        self.filter_preview.watch(filter_obj)
         
-        if filter_name == "invert" and hasattr(filter_obj, 'apply_btn'):
+        if hasattr(filter_obj, 'apply_btn'):
             try:
                 filter_obj.apply_btn.clicked.disconnect()
             except:
@@ -376,38 +424,158 @@ class ImageEditor(QMainWindow):
             filter_obj.apply_btn.clicked.connect(lambda: self.apply_filter_to_canvas(filter_obj))
             print(f"[Filter] Connected {filter_name} apply button")
 
+    def closeEvent(self, event):
+        """Stop filter jobs and release document resources when the window closes."""
+        self.filter_runner.cancel_all()
+        self.filter_runner.wait()
+        self.document.close()
+        super().closeEvent(event)
+
     def choose_color(self):
         self.color_picker_widget.choose_color()
 
     def on_color_changed(self, color):
         self.current_color = color
         for tool in self.orchestrator.get_actions():
-            if tool.needs_color() and hasattr(tool, 'update_color_display'):
-                tool.update_color_display(color)
+            if tool.needs_color():
+                tool.current_color = color
+                if hasattr(tool, 'update_color_display'):
+                    tool.update_color_display(color)
+
+    def on_color_picked(self, color, final):
+        """Show eyedropper samples live; only the released one joins the recent colors."""
+        self.color_picker_widget.set_color(color, remember=final)
     
     def apply_filter_to_canvas(self, filter_obj):
         """Apply a filter to the canvas with undo/redo support."""
-
-        
         print(f"[Filter] Applying {filter_obj.name} filter...")
-        
+        # Settings are read once, here; the tiles must not touch the settings widgets
+        filter_func, halo, parameters = filter_obj.snapshot()
+        self.run_filter_job(filter_obj.name,
+                            lambda image: tile_scheduler.run_tiled(image, filter_func, halo),
+                            parameters, halo)
+    
+    def apply_filter_chain(self, operation, chain_name):
+        """Apply a chain of point-operation filters in one pass as a single command."""
+        print(f"[Filter] Applying chain: {chain_name}")
+
+        def apply_chain(image):
+            image = image.convertToFormat(QImage.Format_ARGB32)
+            operation.apply(pixel_buffer.view(image))
+            return image
+
+        self.run_filter_job(chain_name, lambda image: tile_scheduler.run_tiled(image, apply_chain, 0),
+                            self.filter_chain_widget.get_parameters())
+
+    def run_filter_job(self, name, filter_func, parameters, halo=0):
+        """
+        Run a filter on a worker thread and commit it as a FilterCommand.
+
+        The job works on copy-on-write snapshots of the canvas and background,
+        so painting continues while it runs. Its result is only committed if
+        the document is still at the revision the snapshots were taken from.
+        A result cached for this revision and these settings is committed
+        right away. With a selection, only its bounding box is processed.
+
+        Args:
+            name: Filter name shown in progress and undo history
+            filter_func: Function that takes QImage and returns filtered QImage;
+                it runs on worker threads, so it must not read any widgets
+            parameters: Hashable filter settings, part of the cache key
+            halo: Kernel radius of the filter (None if it cannot be tiled)
+        """
+        if self.filter_runner.is_busy():
+            self.statusBar().showMessage("A filter is already running", 3000)
+            return
+
+        self.filter_preview.cancel()
+
+        selection = self.document.selection
+        halo = halo or 0
+        cache = self.document.filter_cache
+        region = ('selection', selection.serial) if selection is not None else None
+        cache_key = cache.make_key(self.document.revision, name, parameters, region)
+        if cache.get(cache_key) is not None:
+            print(f"[Filter] Reusing cached {name} result")
+            self.commit_filter(name, filter_func, cache_key, selection, halo)
+            return
+
+        background_item = self.document.background_item
+        canvas_image = QImage(self.document.get_canvas_image())
+        background_image = QImage(background_item.image()) if background_item else None
+
+        def work():
+            return FilterCommand.render(filter_func, canvas_image, background_image, selection, halo)
+
+        job = self.filter_runner.submit(name, work)
+        job.data['revision'] = self.document.revision
+        job.data['cache_key'] = cache_key
+        job.data['selection'] = selection
+        self.set_filter_busy(True, f"Applying {name}...")
+
+    def set_filter_busy(self, busy, message=""):
+        """Show or hide filter progress; settings stay locked while a job runs."""
+        self.filter_progress.setValue(0)
+        self.filter_progress.setVisible(busy)
+        self.filter_cancel_btn.setVisible(busy)
+        self.options_stack.setEnabled(not busy)
+        self.filter_chain_widget.setEnabled(not busy)
+        if message:
+            self.statusBar().showMessage(message)
+        else:
+            self.statusBar().clearMessage()
+
+    def on_filter_progress(self, job, percent):
+        self.filter_progress.setValue(percent)
+
+    def on_filter_finished(self, job):
+        if QApplication.mouseButtons() != Qt.NoButton:
+            # Don't commit in the middle of a stroke; retry once it ends
+            self.filter_runner.jobs.append(job)
+            QTimer.singleShot(50, lambda: self._retry_filter_commit(job))
+            return
+
+        self.set_filter_busy(False)
+        if job.data['revision'] != self.document.revision:
+            print(f"[Filter] {job.name} discarded, the canvas changed while it ran")
+            self.statusBar().showMessage(f"{job.name} discarded: the canvas changed while it ran", 5000)
+            return
+
+        before_image, after_image = job.result
+        self.commit_filter(job.name, None, job.data['cache_key'], job.data['selection'],
+                           before_image=before_image, after_image=after_image)
+
+    def commit_filter(self, name, filter_func, cache_key, selection=None, halo=0,
+                      before_image=None, after_image=None):
+        """Execute a FilterCommand, sharing results with the filter cache."""
         canvas_rect = QRectF(0, 0, self.document.width, self.document.height)
-        
-        command = FilterCommand(
-            self.document.scene,
-            filter_obj.apply_filter,
-            filter_obj.name,
-            canvas_rect
-        )
-        
-        print(f"[Filter] FilterCommand created, executing...")
-        
+        command = FilterCommand(self.document.scene, filter_func, name, canvas_rect,
+                                before_image=before_image, after_image=after_image,
+                                cache=self.document.filter_cache, cache_key=cache_key,
+                                selection=selection, halo=halo)
         self.document.execute_command(command)
         self.update_undo_redo_states()
         self.view.viewport().update()
-        
-        print(f"[Filter] {filter_obj.name} filter applied successfully!")
-    
+
+        print(f"[Filter] {name} filter applied successfully!")
+
+    def _retry_filter_commit(self, job):
+        self.filter_runner.jobs.remove(job)
+        if job.cancelled:
+            self.on_filter_cancelled(job)
+        else:
+            self.on_filter_finished(job)
+
+    def on_filter_failed(self, job, message):
+        self.set_filter_busy(False)
+        print(f"[Filter] {job.name} failed: {message}")
+        QMessageBox.warning(self, "Filter Failed", f"{job.name} failed:\n{message}")
+
+    def on_filter_cancelled(self, job):
+        self.set_filter_busy(False)
+        print(f"[Filter] {job.name} cancelled")
+        self.statusBar().showMessage(f"{job.name} cancelled", 3000)
+
     def new_document(self):
         """Create a new blank document."""
         reply = QMessageBox.question(self, 'New Document',
@@ -416,22 +584,9 @@ class ImageEditor(QMainWindow):
                                     QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            self.document.scene.clear()
-            
-            checkerboard = self.document._create_checkerboard(int(self.document.width), int(self.document.height))
-            self.document.checkerboard_item = QGraphicsPixmapItem(checkerboard)
-            self.document.checkerboard_item.setData(0, 'checkerboard')
-            self.document.checkerboard_item.setZValue(-1)
-            self.document.scene.addItem(self.document.checkerboard_item)
-            
-            self.document.canvas_image = QImage(int(self.document.width), int(self.document.height), QImage.Format_ARGB32)
-            self.document.canvas_image.fill(0x00000000)
-            
-            self.document.canvas_pixmap_item = QGraphicsPixmapItem(QPixmap.fromImage(self.document.canvas_image))
-            self.document.canvas_pixmap_item.setData(0, 'canvas')
-            self.document.scene.addItem(self.document.canvas_pixmap_item)
-            
-            self.document.clear_history()
+            self.filter_preview.cancel()
+            self.filter_runner.cancel_all()
+            self.document.reset(self.document.width, self.document.height)
             self.update_undo_redo_states()
             self.view.viewport().update()
     
@@ -445,37 +600,16 @@ class ImageEditor(QMainWindow):
         )
         
         if filename:
-            pixmap = QPixmap(filename)
-            if not pixmap.isNull():
-                self.document.scene.clear()
-                
-                self.document.scene.setSceneRect(0, 0, pixmap.width(), pixmap.height())
-                self.document.width = pixmap.width()
-                self.document.height = pixmap.height()
-                
-                checkerboard = self.document._create_checkerboard(pixmap.width(), pixmap.height())
-                self.document.checkerboard_item = QGraphicsPixmapItem(checkerboard)
-                self.document.checkerboard_item.setData(0, 'checkerboard')
-                self.document.checkerboard_item.setZValue(-2)
-                self.document.scene.addItem(self.document.checkerboard_item)
-                
-                background_item = QGraphicsPixmapItem(pixmap)
-                background_item.setData(0, 'background')
-                background_item.setZValue(-1)
-                self.document.scene.addItem(background_item)
-                
-                self.document.canvas_image = QImage(pixmap.width(), pixmap.height(), QImage.Format_ARGB32)
-                self.document.canvas_image.fill(0x00000000)
-                self.document.canvas_pixmap_item = QGraphicsPixmapItem(QPixmap.fromImage(self.document.canvas_image))
-                self.document.canvas_pixmap_item.setData(0, 'canvas')
-                self.document.canvas_pixmap_item.setZValue(0)
-                self.document.scene.addItem(self.document.canvas_pixmap_item)
+            image = QImage(filename)
+            if not image.isNull():
+                self.filter_preview.cancel()
+                self.filter_runner.cancel_all()
+                self.document.reset(image.width(), image.height(), image)
                 
                 self.view.setSceneRect(self.document.scene.sceneRect())
                 
                 self.fit_to_window()
                 
-                self.document.clear_history()
                 self.update_undo_redo_states()
                 self.view.viewport().update()
             else:
@@ -524,6 +658,7 @@ class ImageEditor(QMainWindow):
         if new_zoom <= self.view.max_zoom:
             self.view.current_zoom = new_zoom
             self.view.scale(zoom_factor, zoom_factor)
+            self.view.view_changed.emit()
     
     def zoom_out(self):
         """Zoom out by 20%."""
@@ -533,11 +668,13 @@ class ImageEditor(QMainWindow):
         if new_zoom >= self.view.min_zoom:
             self.view.current_zoom = new_zoom
             self.view.scale(zoom_factor, zoom_factor)
+            self.view.view_changed.emit()
     
     def zoom_reset(self):
         """Reset zoom to 100%."""
         self.view.resetTransform()
         self.view.current_zoom = 1.0
+        self.view.view_changed.emit()
     
     def fit_to_window(self):
         """Fit the entire canvas to the window."""
@@ -558,3 +695,4 @@ class ImageEditor(QMainWindow):
         self.view.current_zoom = target_zoom
         
         self.view.centerOn(canvas_rect.center())
+        self.view.view_changed.emit()
@@ -1,19 +1,23 @@
 """
 Command for applying filters to the canvas.
 
-Stores a snapshot of the scene before applying the filter for undo.
+Stores a snapshot of the scene before applying the filter for undo. With
+a selection, only the selection's bounding box is filtered and snapshotted.
 """
 
-from PyQt5.QtWidgets import QGraphicsPixmapItem
-from PyQt5.QtGui import QPixmap, QImage, QPainter
-from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import QRect, QRectF
 from src.core.command import ICommand
+from src.core.image_snapshot import ImageSnapshot
+from src.core.item_registry import ItemRole
 
 
 class FilterCommand(ICommand):
     """Command for filter operations."""
     
-    def __init__(self, scene, filter_func, filter_name="Filter", canvas_rect=None):
+    def __init__(self, scene, filter_func, filter_name="Filter", canvas_rect=None,
+                 before_image=None, after_image=None, cache=None, cache_key=None,
+                 selection=None, halo=0):
         """
         Initialize filter command.
         
@@ -22,59 +26,132 @@ class FilterCommand(ICommand):
             filter_func: Function that takes QImage and returns filtered QImage
             filter_name: Display name for the filter
             canvas_rect: Optional QRectF for actual canvas area (defaults to scene rect)
+            before_image: Precomputed render() undo image (taken from the scene if None)
+            after_image: Precomputed render() result (computed with filter_func if None)
+            cache: Optional FilterCache consulted before filtering and updated after
+            cache_key: Key of this filter's result in the cache
+            selection: Optional Selection restricting the filter to its bounding box
+            halo: Pixels of context the filter reads around each output pixel
         """
         self.filter_name = filter_name
         self.filter_func = filter_func
+        self.rect = QRect(selection.rect) if selection is not None else None
         
-        self.canvas_item = None
-        self.background_item = None
-        
-        for item in scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                if item.data(0) == 'canvas':
-                    self.canvas_item = item
-                elif item.data(0) == 'background':
-                    self.background_item = item
+        self.canvas_item = scene.registry.get(ItemRole.CANVAS)
+        self.background_item = scene.registry.get(ItemRole.BACKGROUND)
         
         if not self.canvas_item:
             raise ValueError("Canvas item not found in scene")
         
-        canvas_image = self.canvas_item.pixmap().toImage()
-        
-        if self.background_item:
-            from PyQt5.QtGui import QPainter
-            background_image = self.background_item.pixmap().toImage()
-            
-            merged = background_image.copy()
-            painter = QPainter(merged)
-            painter.drawImage(0, 0, canvas_image)
-            painter.end()
-            
-            self.before_image = merged
+        if after_image is None and cache is not None:
+            after_image = cache.get(cache_key)
+        
+        if before_image is None or after_image is None:
+            background_image = self.background_item.image() if self.background_item else None
+            before, after = self.render(filter_func if after_image is None else None,
+                                        self.canvas_item.image(), background_image, selection, halo)
+            if before_image is None:
+                before_image = before
+            if after_image is None:
+                after_image = after
+        
+        if cache is not None:
+            cache.put(cache_key, after_image)
+        
+        self.after_image = ImageSnapshot(after_image)
+        self.before_image = ImageSnapshot(before_image)
+    
+    @staticmethod
+    def merge_source(canvas_image, background_image=None, rect=None):
+        """
+        Build the image a filter runs on: the canvas over the background.
+        
+        Safe to call off the GUI thread with shallow QImage copies.
+        
+        Args:
+            canvas_image: Canvas pixels
+            background_image: Optional opened image beneath the canvas
+            rect: Optional canvas region to merge (defaults to the whole canvas)
+        
+        Returns:
+            QImage: Merged image (a cheap copy of the canvas without background)
+        """
+        if rect is None:
+            rect = canvas_image.rect()
+            canvas_part = QImage(canvas_image)
         else:
-            self.before_image = canvas_image
+            canvas_part = canvas_image.copy(rect)
         
-        self.after_image = filter_func(self.before_image.copy())
+        if background_image is None:
+            return canvas_part
+        
+        merged = background_image.copy(rect).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        painter = QPainter(merged)
+        painter.drawImage(0, 0, canvas_part)
+        painter.end()
+        return merged
+    
+    @staticmethod
+    def render(filter_func, canvas_image, background_image=None, selection=None, halo=0):
+        """
+        Compute the undo image and the filter result.
+        
+        Without a selection both cover the whole canvas. With one they only
+        cover its bounding box: the filter sees the box grown by halo pixels
+        of context, and its output is blended into the canvas through the
+        selection mask. Safe to call off the GUI thread with shallow copies.
+        
+        Args:
+            filter_func: Function that takes QImage and returns filtered QImage,
+                or None to only capture the undo image
+            canvas_image: Canvas pixels
+            background_image: Optional opened image beneath the canvas
+            selection: Optional Selection
+            halo: Kernel radius of the filter
+        
+        Returns:
+            tuple: (before, after) QImages; after is None without filter_func
+        """
+        if selection is None:
+            before = FilterCommand.merge_source(canvas_image, background_image)
+            return before, filter_func(before.copy()) if filter_func else None
+        
+        rect = selection.rect
+        before = canvas_image.copy(rect)
+        if filter_func is None:
+            return before, None
+        
+        region = rect.adjusted(-halo, -halo, halo, halo).intersected(canvas_image.rect())
+        filtered = filter_func(FilterCommand.merge_source(canvas_image, background_image, region))
+        filtered = filtered.copy(rect.translated(-region.topLeft()))
+        return before, selection.blend(filtered, before)
     
     def _apply_image_to_canvas(self, scene, image):
-        """Replace only the canvas pixmap with the given image."""
-        canvas_item = None
-        for item in scene.items():
-            if isinstance(item, QGraphicsPixmapItem) and item.data(0) == 'canvas':
-                canvas_item = item
-                break
-        
-        if canvas_item:
-            canvas_item.setPixmap(QPixmap.fromImage(image))
+        """Replace the canvas surface, or just the selection box, with the given image."""
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if not canvas_item:
+            return
+        if self.rect is None:
+            canvas_item.set_image(image)
+            return
+        painter = QPainter(canvas_item.image())
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(self.rect.topLeft(), image)
+        painter.end()
+        canvas_item.mark_dirty(self.rect)
     
     def execute(self, scene):
         """Apply the filter to the canvas."""
-        self._apply_image_to_canvas(scene, self.after_image)
+        self._apply_image_to_canvas(scene, self.after_image.image())
     
     def undo(self, scene):
         """Restore the canvas to before the filter was applied."""
-        self._apply_image_to_canvas(scene, self.before_image)
+        self._apply_image_to_canvas(scene, self.before_image.image())
     
+    def get_snapshots(self) -> list:
+        """Get the before/after image snapshots."""
+        return [self.before_image, self.after_image]
+
     def get_name(self) -> str:
         """Get command name."""
         return f"{self.filter_name} Filter"
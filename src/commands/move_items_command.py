@@ -0,0 +1,48 @@
+"""
+Command for moving shape/text items.
+
+Stores the moved items and one offset shared by all of them.
+"""
+
+from PyQt5.QtCore import QPointF
+from src.core.command import ICommand
+
+
+class MoveItemsCommand(ICommand):
+    """Command for moving any number of scene items by the same offset."""
+
+    def __init__(self, items: list, offset: QPointF):
+        """
+        Initialize move command.
+
+        Args:
+            items: Graphics items to move
+            offset: Distance to move them in scene coordinates
+        """
+        self.items = list(items)
+        self.offset = QPointF(offset)
+
+    def _move_by(self, scene, dx, dy):
+        changed = []
+        for item in self.items:
+            changed.append(item.sceneBoundingRect())
+            item.moveBy(dx, dy)
+            changed.append(item.sceneBoundingRect())
+        scene.composite.invalidate_rects(changed)
+        scene.vectors.select(scene.vectors.selected)  # Outline follows the moved items
+
+    def execute(self, scene):
+        """Move the items by the offset."""
+        self._move_by(scene, self.offset.x(), self.offset.y())
+
+    def undo(self, scene):
+        """Move the items back."""
+        self._move_by(scene, -self.offset.x(), -self.offset.y())
+
+    def get_scene_items(self) -> list:
+        """Get the items this command moves."""
+        return self.items
+
+    def get_name(self) -> str:
+        """Get command name."""
+        return "Move Object" if len(self.items) == 1 else f"Move {len(self.items)} Objects"
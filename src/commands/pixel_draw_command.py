@@ -1,49 +1,59 @@
 """
 Command for pixel-based drawing operations.
 
-Stores before/after QImage snapshots for undo/redo functionality.
+Stores before/after QImage patches of the region a stroke touched
+for undo/redo functionality.
 """
 
+from PyQt5.QtCore import QRect
 from PyQt5.QtGui import QImage
 from src.core.command import ICommand
+from src.core.image_snapshot import ImageSnapshot
+from src.core.item_registry import ItemRole
 
 
 class PixelDrawCommand(ICommand):
     """Command for pixel-based brush/eraser drawing operations."""
-    
-    def __init__(self, before_image: QImage, after_image: QImage, name: str = "Draw"):
+
+    def __init__(self, rect: QRect, before_patch: QImage, after_patch: QImage, name: str = "Draw"):
         """
         Initialize pixel draw command.
-        
+
         Args:
-            before_image: Canvas state before drawing
-            after_image: Canvas state after drawing
+            rect: Canvas rectangle the patches cover
+            before_patch: Pixels inside rect before drawing
+            after_patch: Pixels inside rect after drawing
             name: Display name for the command
         """
-        self.before_image = before_image.copy()
-        self.after_image = after_image.copy()
+        self.rect = QRect(rect)
+        self.before_patch = ImageSnapshot(before_patch)
+        self.after_patch = ImageSnapshot(after_patch)
         self.name = name
-    
+
+    def _apply_patch(self, scene, snapshot):
+        """Paint a patch snapshot over the canvas at the command's rect."""
+        from PyQt5.QtGui import QPainter
+
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if canvas_item:
+            painter = QPainter(canvas_item.image())
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(self.rect.topLeft(), snapshot.image())
+            painter.end()
+            canvas_item.mark_dirty(self.rect)
+
     def execute(self, scene):
-        """Apply the after image to the canvas."""
-        from PyQt5.QtGui import QPixmap
-        items = scene.items()
-        
-        for item in items:
-            if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                item.setPixmap(QPixmap.fromImage(self.after_image))
-                break
-    
+        """Apply the after patch to the canvas."""
+        self._apply_patch(scene, self.after_patch)
+
     def undo(self, scene):
-        """Restore the before image to the canvas."""
-        from PyQt5.QtGui import QPixmap
-        items = scene.items()
-        
-        for item in items:
-            if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                item.setPixmap(QPixmap.fromImage(self.before_image))
-                break
-    
+        """Restore the before patch to the canvas."""
+        self._apply_patch(scene, self.before_patch)
+
+    def get_snapshots(self) -> list:
+        """Get the before/after patch snapshots."""
+        return [self.before_patch, self.after_patch]
+
     def get_name(self) -> str:
         """Get command name."""
         return self.name
@@ -24,11 +24,15 @@ class ShapeCommand(ICommand):
     
     def execute(self, scene):
         """Add the shape to the scene."""
-        scene.addItem(self.shape_item)
+        scene.vectors.add(self.shape_item)
     
     def undo(self, scene):
         """Remove the shape from the scene."""
-        scene.removeItem(self.shape_item)
+        scene.vectors.remove(self.shape_item)
+    
+    def get_scene_items(self) -> list:
+        """Get the item this command adds."""
+        return [self.shape_item]
     
     def get_name(self) -> str:
         """Get command name."""
@@ -22,11 +22,15 @@ class TextCommand(ICommand):
     
     def execute(self, scene):
         """Add the text item to the scene."""
-        scene.addItem(self.text_item)
+        scene.vectors.add(self.text_item)
     
     def undo(self, scene):
         """Remove the text item from the scene."""
-        scene.removeItem(self.text_item)
+        scene.vectors.remove(self.text_item)
+    
+    def get_scene_items(self) -> list:
+        """Get the item this command adds."""
+        return [self.text_item]
     
     def get_name(self) -> str:
         """Get command name."""
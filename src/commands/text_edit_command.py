@@ -0,0 +1,53 @@
+"""
+Command for editing the text of a text item.
+
+Stores only the span an editing session changed, not the whole text.
+"""
+
+from src.core.command import ICommand
+
+
+class TextEditCommand(ICommand):
+    """Command for replacing one span of a text item's text."""
+
+    def __init__(self, text_item, position: int, removed: str, inserted: str):
+        """
+        Initialize text edit command.
+
+        The edit has already been typed into the item when the command is
+        created, so the first execute() leaves the text alone.
+
+        Args:
+            text_item: EditableTextItem that was edited
+            position: Character offset of the changed span
+            removed: Text the span held before the edit
+            inserted: Text the span holds after the edit
+        """
+        self.text_item = text_item
+        self.position = position
+        self.removed = removed
+        self.inserted = inserted
+        self._applied = True
+
+    def execute(self, scene):
+        """Put the inserted text back in place of the removed text."""
+        if not self._applied:
+            self.text_item.replace_text(self.position, len(self.removed), self.inserted)
+            self._applied = True
+
+    def undo(self, scene):
+        """Put the removed text back in place of the inserted text."""
+        self.text_item.replace_text(self.position, len(self.inserted), self.removed)
+        self._applied = False
+
+    def get_scene_items(self) -> list:
+        """Get the item this command edits."""
+        return [self.text_item]
+
+    def get_memory_size(self) -> int:
+        """Get the approximate number of bytes the changed span keeps alive."""
+        return 2 * (len(self.removed) + len(self.inserted))
+
+    def get_name(self) -> str:
+        """Get command name."""
+        return "Edit Text"
@@ -100,6 +100,12 @@ class ActionOrchestrator:
             return self.current_action.mouse_move_event(event, scene, view)
         return None
     
+    def handle_mouse_move_batch(self, events, scene, view):
+        """Handle a frame's worth of coalesced mouse moves - delegate to current action."""
+        if self.current_action and hasattr(self.current_action, 'mouse_move_batch_event'):
+            return self.current_action.mouse_move_batch_event(events, scene, view)
+        return self.handle_mouse_move(events[-1], scene, view)
+    
     def handle_mouse_release(self, event, scene, view):
         """Handle mouse release - delegate to current action."""
         if self.current_action and hasattr(self.current_action, 'mouse_release_event'):
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from PyQt5.QtWidgets import QWidget, QAction
+from PyQt5.QtWidgets import QWidget, QAction, QSlider, QComboBox, QCheckBox
 from PyQt5.QtGui import QIcon
 
 
@@ -26,6 +26,86 @@ class BaseFilter(ABC):
     def apply_filter(self, image):
         pass
 
+    def make_filter_func(self):
+        """
+        Get a function that applies the filter with its current settings.
+
+        The settings are read here, on the GUI thread. The returned function
+        only touches the image it is given, so it can run on worker threads.
+        The default suits filters whose apply_filter() reads no widgets.
+
+        Returns:
+            callable: Function that takes a QImage and returns the filtered QImage
+        """
+        return self.apply_filter
+
+    def apply_preview(self, image, scale):
+        """
+        Apply the filter to a downscaled preview image.
+
+        Filters with spatial parameters (radii, distances) override this
+        to shrink them by the same factor as the image.
+
+        Args:
+            image: QImage of the visible region at preview resolution
+            scale: Preview pixels per document pixel (<= 1)
+
+        Returns:
+            QImage: Filtered preview
+        """
+        return self.apply_filter(image)
+
+    def get_point_operation(self):
+        """
+        Describe the current settings as a PointOperation.
+
+        Filters that map each pixel independently of its neighbours
+        override this so they can be fused into one pass with others.
+
+        Returns:
+            PointOperation or None if the filter is not a point operation
+        """
+        return None
+
+    def get_kernel_radius(self):
+        """
+        Get how far, in pixels, an output pixel depends on its neighbours.
+
+        The tile scheduler adds this much overlap around each tile. Point
+        operations need none; filters with a spatial kernel override this
+        for their current settings.
+
+        Returns:
+            int or None if the filter cannot be split into tiles
+        """
+        return 0 if self.get_point_operation() is not None else None
+
+    def get_parameters(self) -> tuple:
+        """
+        Get the current settings as a hashable tuple, e.g. for caching results.
+
+        The default reads every slider, combo box and checkbox of the
+        settings panel, in a stable order.
+        """
+        widget = self._settings_widget
+        if widget is None:
+            return ()
+        return (tuple(slider.value() for slider in widget.findChildren(QSlider)) +
+                tuple(combo.currentIndex() for combo in widget.findChildren(QComboBox)) +
+                tuple(checkbox.isChecked() for checkbox in widget.findChildren(QCheckBox)))
+
+    def snapshot(self):
+        """
+        Read everything a tiled filter job needs from the current settings.
+
+        Called on the GUI thread; the function, its kernel radius and the
+        cache parameters all describe the same settings.
+
+        Returns:
+            tuple: (filter function, kernel radius or None, parameters)
+        """
+        return self.make_filter_func(), self.get_kernel_radius(), self.get_parameters()
+
     def get_action(self) -> QAction:
         return self._action
 
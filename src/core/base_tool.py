@@ -51,6 +51,13 @@ class BaseTool(BaseAction):
         """Called when mouse is moved on canvas"""
         pass
 
+    def mouse_move_batch_event(self, events, scene, view=None):
+        """
+        Called with all mouse moves coalesced during one frame.
+        Default implementation only handles the most recent event.
+        """
+        self.mouse_move_event(events[-1], scene, view)
+
     def mouse_release_event(self, event, scene, view=None):
         """Called when mouse is released on canvas"""
         pass
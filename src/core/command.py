@@ -39,3 +39,36 @@ class ICommand(ABC):
             str: Human-readable command name
         """
         pass
+
+    def get_snapshots(self) -> list:
+        """
+        Get the image snapshots this command keeps for undo/redo.
+
+        The history uses these to account for memory and to compress
+        commands that are no longer likely to be undone.
+
+        Returns:
+            list: ImageSnapshot objects owned by the command
+        """
+        return []
+
+    def get_scene_items(self) -> list:
+        """
+        Get the graphics items this command adds to or removes from the scene.
+
+        The document uses these to re-materialise flattened items before
+        the command is undone or redone.
+
+        Returns:
+            list: QGraphicsItem objects owned by the command
+        """
+        return []
+
+    def get_memory_size(self) -> int:
+        """
+        Get the approximate number of bytes the command keeps alive.
+
+        Returns:
+            int: Memory footprint in bytes
+        """
+        return sum(snapshot.nbytes() for snapshot in self.get_snapshots())
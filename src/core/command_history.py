@@ -2,97 +2,168 @@
 Command history manager for undo/redo functionality.
 
 Maintains two stacks (undo and redo) and manages command execution.
+The history is bounded by a byte budget: each command reports its memory
+footprint, the oldest commands are evicted first, and snapshots of
+commands that fall out of the most recent few are compressed on a
+background thread. With a SwapFile, deeper commands are spilled to disk
+and only paged back in when undo reaches them.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from src.core.command import ICommand
 
 
 class CommandHistory:
     """Manages undo/redo command stacks."""
-    
-    def __init__(self, max_undo: int = 100):
+
+    def __init__(self, max_undo: int = 100, max_bytes: int = 512 * 1024 * 1024,
+                 hot_commands: int = 2, swap_file=None, spill_after: int = 8,
+                 max_swap_bytes: int = 8 * 1024 * 1024 * 1024):
         """
         Initialize command history.
-        
+
         Args:
             max_undo: Maximum number of commands to keep in undo stack
+            max_bytes: Memory budget for undo and redo payloads in bytes
+            hot_commands: Number of most recent commands kept uncompressed
+            swap_file: Optional SwapFile that receives spilled payloads
+            spill_after: Number of most recent commands kept in RAM when spilling
+            max_swap_bytes: Budget for payloads spilled to the swap file
         """
         self.undo_stack: List[ICommand] = []
         self.redo_stack: List[ICommand] = []
         self.max_undo = max_undo
-    
+        self.max_bytes = max_bytes
+        self.hot_commands = hot_commands
+        self.swap_file = swap_file
+        self.spill_after = spill_after
+        self.max_swap_bytes = max_swap_bytes
+        self._compressor = ThreadPoolExecutor(max_workers=1,
+                                              thread_name_prefix="history-compress")
+
     def execute(self, command: ICommand, scene):
         """
         Execute a command and add to undo stack.
-        
+
         Args:
             command: Command to execute
             scene: QGraphicsScene to operate on
         """
         command.execute(scene)
         self.undo_stack.append(command)
+        self._discard_commands(self.redo_stack)
         self.redo_stack.clear()
-        if len(self.undo_stack) > self.max_undo:
-            self.undo_stack.pop(0)
-    
+        self._age_commands()
+        self._enforce_budget()
+
     def undo(self, scene) -> bool:
         """
         Undo the last command.
-        
+
         Args:
             scene: QGraphicsScene to operate on
-            
+
         Returns:
             bool: True if undo was performed, False if nothing to undo
         """
         if not self.can_undo():
             return False
-        
+
         command = self.undo_stack.pop()
         command.undo(scene)
         self.redo_stack.append(command)
         return True
-    
+
     def redo(self, scene) -> bool:
         """
         Redo the last undone command.
-        
+
         Args:
             scene: QGraphicsScene to operate on
-            
+
         Returns:
             bool: True if redo was performed, False if nothing to redo
         """
         if not self.can_redo():
             return False
-        
+
         command = self.redo_stack.pop()
         command.execute(scene)
         self.undo_stack.append(command)
+        self._age_commands()
         return True
-    
+
+    def _age_commands(self):
+        """Queue compression/spilling for commands that just got colder."""
+        if len(self.undo_stack) > self.hot_commands:
+            command = self.undo_stack[-(self.hot_commands + 1)]
+            for snapshot in command.get_snapshots():
+                if not snapshot.is_compressed():
+                    self._compressor.submit(snapshot.compress)
+
+        if self.swap_file is not None and len(self.undo_stack) > self.spill_after:
+            command = self.undo_stack[-(self.spill_after + 1)]
+            for snapshot in command.get_snapshots():
+                if not snapshot.is_spilled():
+                    self._compressor.submit(snapshot.spill, self.swap_file)
+
+    def _discard_commands(self, commands):
+        """Release swap space held by commands that are being dropped."""
+        for command in commands:
+            for snapshot in command.get_snapshots():
+                snapshot.discard()
+
+    def _enforce_budget(self):
+        """Evict the oldest undo commands until count and byte limits hold."""
+        while len(self.undo_stack) > self.max_undo:
+            self._discard_commands([self.undo_stack.pop(0)])
+
+        while len(self.undo_stack) > 1 and self.get_memory_usage() > self.max_bytes:
+            evicted = self.undo_stack.pop(0)
+            self._discard_commands([evicted])
+            print(f"[History] Evicted '{evicted.get_name()}' to stay within memory budget")
+
+        while (self.swap_file is not None and len(self.undo_stack) > 1
+               and self.swap_file.used_bytes > self.max_swap_bytes):
+            evicted = self.undo_stack.pop(0)
+            self._discard_commands([evicted])
+            print(f"[History] Evicted '{evicted.get_name()}' to stay within swap budget")
+
+    def get_memory_usage(self) -> int:
+        """Get the number of bytes held by all commands in both stacks."""
+        return sum(command.get_memory_size()
+                   for command in self.undo_stack + self.redo_stack)
+
     def can_undo(self) -> bool:
         """Check if undo is available."""
         return len(self.undo_stack) > 0
-    
+
     def can_redo(self) -> bool:
         """Check if redo is available."""
         return len(self.redo_stack) > 0
-    
+
     def get_undo_name(self) -> str:
         """Get name of command that would be undone."""
         if self.can_undo():
             return self.undo_stack[-1].get_name()
         return ""
-    
+
     def get_redo_name(self) -> str:
         """Get name of command that would be redone."""
         if self.can_redo():
             return self.redo_stack[-1].get_name()
         return ""
-    
+
     def clear(self):
         """Clear all command history."""
+        self._discard_commands(self.undo_stack + self.redo_stack)
         self.undo_stack.clear()
         self.redo_stack.clear()
+
+    def close(self):
+        """Drop all history, stop the background worker and close the swap file."""
+        self.clear()
+        self._compressor.shutdown(wait=True, cancel_futures=True)
+        if self.swap_file is not None:
+            self.swap_file.close()
@@ -0,0 +1,149 @@
+"""
+Cached composite of what the document shows, for reading pixel colors.
+
+The composite is kept as tiles that are rendered on first use: the
+background, the canvas, flattened and live shape/text items, without
+the transparency checkerboard, selection outlines or a shape being
+dragged. Code that changes what the document shows drops the tiles
+under the changed area through invalidate_rects(): TiledCanvasItem when
+pixels are marked dirty, VectorLayer and the move command when shape/text
+items come, go or move, and EditableTextItem when its text changes. After
+an edit the next read re-renders a tile or two rather than the image.
+
+The scene's changed() signal is deliberately not used: connecting to it
+makes Qt stop updating views directly from dirty items and repaint them
+through updateScene() instead, which would undo the dirty-rect repaints
+of the canvas tiles.
+"""
+
+import numpy as np
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QImage, QPainter, QColor
+from PyQt5.QtWidgets import QStyleOptionGraphicsItem
+
+from src.core import pixel_buffer
+from src.core.pixel_buffer import B, G, R, A
+from src.core.tiled_canvas_item import TiledCanvasItem
+
+
+SKIPPED_ROLES = ('checkerboard', 'selection', 'shape_preview', 'object_selection')
+
+
+class CompositeCache:
+    """Lazily rendered, tile-invalidated composite of a scene."""
+
+    TILE_SIZE = TiledCanvasItem.TILE_SIZE
+
+    def __init__(self, scene):
+        """
+        Initialize composite cache.
+
+        Args:
+            scene: DocumentScene to composite
+        """
+        self.scene = scene
+        self._tiles = {}  # (column, row) -> (QImage, pixel view)
+
+    def invalidate(self):
+        """Drop every tile, e.g. when the document is replaced."""
+        self._tiles.clear()
+
+    def invalidate_rects(self, rects):
+        """Drop the tiles under changed scene rectangles (QRectF list)."""
+        if not self._tiles:
+            return
+        size = self.TILE_SIZE
+        for rect in rects:
+            rect = rect.toAlignedRect()
+            for row in range(rect.top() // size, rect.bottom() // size + 1):
+                for column in range(rect.left() // size, rect.right() // size + 1):
+                    self._tiles.pop((column, row), None)
+
+    def _tile(self, column, row):
+        tile = self._tiles.get((column, row))
+        if tile is None:
+            image = self._render(QRect(column * self.TILE_SIZE, row * self.TILE_SIZE,
+                                       self.TILE_SIZE, self.TILE_SIZE))
+            tile = (image, pixel_buffer.view(image, writable=False))
+            self._tiles[(column, row)] = tile
+        return tile[1]
+
+    def _render(self, rect):
+        image = QImage(rect.size(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(0x00000000)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(-rect.x(), -rect.y())
+        option = QStyleOptionGraphicsItem()
+        for item in self.scene.items(QRectF(rect), Qt.IntersectsItemBoundingRect, Qt.AscendingOrder):
+            if item.data(0) in SKIPPED_ROLES or not item.isVisible():
+                continue
+            painter.save()
+            painter.setTransform(item.sceneTransform(), combine=True)
+            painter.setOpacity(item.effectiveOpacity())
+            option.exposedRect = item.mapRectFromScene(QRectF(rect))
+            item.paint(painter, option, None)
+            painter.restore()
+        painter.end()
+        return image
+
+    def pixels(self, rect):
+        """
+        Get composite pixels inside a rectangle.
+
+        Args:
+            rect: QRect in scene coordinates, clipped to the scene rect
+
+        Returns:
+            np.ndarray: (H, W, 4) premultiplied uint8 pixels; a view into the
+                cache when the rectangle lies inside one tile
+        """
+        rect = rect.intersected(self.scene.sceneRect().toAlignedRect())
+        if rect.isEmpty():
+            return np.empty((0, 0, 4), dtype=np.uint8)
+        size = self.TILE_SIZE
+        first_column, first_row = rect.left() // size, rect.top() // size
+        last_column, last_row = rect.right() // size, rect.bottom() // size
+        if first_column == last_column and first_row == last_row:
+            x, y = rect.left() - first_column * size, rect.top() - first_row * size
+            return self._tile(first_column, first_row)[y:y + rect.height(), x:x + rect.width()]
+
+        result = np.empty((rect.height(), rect.width(), 4), dtype=np.uint8)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                part = rect.intersected(QRect(column * size, row * size, size, size))
+                tile = self._tile(column, row)
+                result[part.top() - rect.top():part.bottom() + 1 - rect.top(),
+                       part.left() - rect.left():part.right() + 1 - rect.left()] = \
+                    tile[part.top() - row * size:part.bottom() + 1 - row * size,
+                         part.left() - column * size:part.right() + 1 - column * size]
+        return result
+
+    def sample(self, x, y, size=1):
+        """
+        Average the composite color in a square around a pixel.
+
+        Args:
+            x: Column in scene coordinates
+            y: Row in scene coordinates
+            size: Edge length of the averaged square (odd)
+
+        Returns:
+            QColor or None if the area is outside the scene or fully transparent
+        """
+        radius = size // 2
+        pixels = self.pixels(QRect(x - radius, y - radius, size, size))
+        if pixels.size == 0:
+            return None
+        if pixels.shape[0] * pixels.shape[1] == 1:
+            total = pixels[0, 0].astype(np.int64)
+        else:
+            total = pixels.sum(axis=(0, 1), dtype=np.int64)
+        alpha = int(total[A])
+        if alpha == 0:
+            return None
+        # Channels are premultiplied: dividing the summed color by the summed
+        # alpha weights each pixel by its coverage.
+        return QColor(min(255, (int(total[R]) * 255 + alpha // 2) // alpha),
+                      min(255, (int(total[G]) * 255 + alpha // 2) // alpha),
+                      min(255, (int(total[B]) * 255 + alpha // 2) // alpha))
@@ -0,0 +1,280 @@
+"""
+Vectorized blur kernels over uint8 pixel arrays.
+
+All kernels work in place on (H, W) or (H, W, C) arrays such as the views
+returned by pixel_buffer.view(). Box blurs keep a running window sum per
+column while sweeping down the rows, so their cost does not depend on the
+radius; horizontal passes run the same sweep on a transposed copy. Window
+sums are turned back into pixels through a lookup table instead of a
+per-pixel division. Gaussian blur is approximated by three box passes.
+"""
+
+import math
+
+import numpy as np
+
+from src.core.pixel_buffer import A
+from src.core.filter_runner import checkpoint, progress_range
+
+
+def _division_table(size):
+    """Map every possible window sum to its rounded average."""
+    sums = np.arange(size * 255 + 1, dtype=np.uint32)
+    return ((sums + size // 2) // size).astype(np.uint8)
+
+
+def _box_columns(pixels, radius, emit=None):
+    """
+    Box blur along axis 0 with a running sum.
+
+    Rows are written back in place, or handed to emit(y, row) instead when
+    given, so a caller can consume the blurred rows without storing them.
+    """
+    height = pixels.shape[0]
+    if radius <= 0 or height < 2:
+        if emit is not None:
+            for y in range(height):
+                emit(y, pixels[y])
+        return
+
+    size = 2 * radius + 1
+    table = _division_table(size)
+    total = np.zeros(pixels.shape[1:], dtype=np.uint16 if size * 255 < 65536 else np.uint32)
+
+    # Rows of the current window, kept because the sweep overwrites them.
+    window = np.empty((size,) + pixels.shape[1:], dtype=np.uint8)
+    for offset in range(-radius, radius + 1):
+        row = pixels[min(max(offset, 0), height - 1)]
+        window[offset + radius] = row
+        total += row
+
+    row = np.empty(pixels.shape[1:], dtype=np.uint8) if emit is not None else None
+    last = height - 1
+    for y in range(height):
+        if y % 64 == 0:
+            checkpoint(y / height)
+        if emit is None:
+            np.take(table, total, out=pixels[y])
+        else:
+            emit(y, np.take(table, total, out=row))
+        if y == last:
+            break
+        slot = y % size
+        total -= window[slot]
+        window[slot] = pixels[min(y + radius + 1, last)]
+        total += window[slot]
+
+
+def _packed(pixels):
+    """View 4-channel pixels as one uint32 per pixel when the layout allows."""
+    if pixels.ndim == 3 and pixels.shape[2] == 4 and pixels.strides[1:] == (4, 1):
+        return pixels.view(np.uint32)[..., 0]
+    return pixels
+
+
+def _transposed(pixels):
+    """Get a contiguous copy of the pixels with rows and columns swapped."""
+    packed = _packed(pixels)
+    columns = np.ascontiguousarray(packed.swapaxes(0, 1))
+    if packed is pixels:
+        return columns
+    return columns.view(np.uint8).reshape(columns.shape + (4,))
+
+
+def _store_transposed(pixels, columns):
+    """Write transposed pixels back into the original layout."""
+    packed = _packed(pixels)
+    if packed is pixels:
+        pixels[...] = columns.swapaxes(0, 1)
+    else:
+        packed[...] = _packed(columns).swapaxes(0, 1)
+
+
+def _separable_box(pixels, horizontal, vertical, target=None, emit=None):
+    """
+    Run box passes along the rows, then along the columns.
+
+    Horizontal passes work on a transposed copy that is then stored into
+    target (pixels by default). With emit, the last vertical pass hands its
+    rows to emit(y, row) instead of writing them. Each pass gets an equal
+    share of the job's progress.
+    """
+    target = pixels if target is None else target
+    steps = len(horizontal) + len(vertical)
+    step = 0
+
+    if horizontal:
+        columns = _transposed(pixels)
+        for radius in horizontal:
+            with progress_range(step / steps, (step + 1) / steps):
+                _box_columns(columns, radius)
+            step += 1
+        _store_transposed(target, columns)
+        del columns
+    elif target is not pixels:
+        target[...] = pixels
+
+    for index, radius in enumerate(vertical):
+        last = index == len(vertical) - 1
+        with progress_range(step / steps, (step + 1) / steps):
+            _box_columns(target, radius, emit=emit if last else None)
+        step += 1
+
+
+def box_blur(pixels, radius):
+    """
+    Box blur with a (2 * radius + 1) square kernel, in place.
+
+    Args:
+        pixels: (H, W) or (H, W, C) uint8 array
+        radius: Kernel radius in pixels
+    """
+    if radius <= 0:
+        return
+    _separable_box(pixels, [radius], [radius])
+
+
+def radius_to_sigma(radius):
+    """
+    Convert a filter's Radius setting to a Gaussian standard deviation.
+
+    Blur and Sharpen share this so the same Radius means the same spread.
+    """
+    return radius / 2.0
+
+
+def gaussian_box_radii(sigma, passes=3):
+    """
+    Get box radii whose repeated application approximates a Gaussian.
+
+    Args:
+        sigma: Standard deviation of the target Gaussian
+        passes: Number of box passes
+
+    Returns:
+        list: One radius per pass; at least one is non-zero when sigma > 0
+    """
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(math.floor(ideal))
+    if lower % 2 == 0:
+        lower -= 1
+    upper = lower + 2
+    split = (12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4)
+    split = int(round(split))
+    radii = [(lower if i < split else upper) // 2 for i in range(passes)]
+    if sigma > 0 and not any(radii):
+        # Below about sigma 0.8 every box rounds down to radius 0; one
+        # radius-1 pass is the smallest blur the approximation can give.
+        radii[-1] = 1
+    return radii
+
+
+def gaussian_support(sigma):
+    """
+    Get how far gaussian_blur() reaches from each pixel.
+
+    Args:
+        sigma: Standard deviation in pixels
+
+    Returns:
+        int: Sum of the box radii, 0 if the blur does nothing
+    """
+    if sigma <= 0:
+        return 0
+    return sum(gaussian_box_radii(sigma))
+
+
+def gaussian_blur(pixels, sigma):
+    """
+    Approximate Gaussian blur using three separable box passes, in place.
+
+    Args:
+        pixels: (H, W) or (H, W, C) uint8 array
+        sigma: Standard deviation in pixels
+    """
+    if sigma <= 0:
+        return
+    radii = gaussian_box_radii(sigma)
+    _separable_box(pixels, radii, radii)
+
+
+def unsharp_mask(pixels, sigma, amount, threshold=0):
+    """
+    Sharpen premultiplied pixels in place with an unsharp mask.
+
+    The low-pass is the three-pass box approximation of a Gaussian. Its
+    last vertical pass is fused with the subtract/scale/clamp step, so each
+    blurred row is combined with the original as soon as it is produced and
+    the only full-size temporary is the blur buffer itself.
+
+    Args:
+        pixels: (H, W, 4) uint8 array in premultiplied byte order
+        sigma: Standard deviation of the low-pass in pixels
+        amount: Strength, where 1.0 adds the full high-pass once
+        threshold: Minimum difference from the low-pass to sharpen (0..255)
+    """
+    if sigma <= 0 or amount <= 0:
+        return
+    gain = int(round(amount * 256))
+
+    def combine(y, low):
+        row = pixels[y]
+        detail = row.astype(np.int32)
+        detail -= low
+        if threshold > 0:
+            detail[np.abs(detail) < threshold] = 0
+        detail *= gain
+        detail += 128
+        detail >>= 8
+        detail += row
+        np.clip(detail, 0, 255, out=detail)
+        # Keep the result a valid premultiplied color (no channel above alpha).
+        np.minimum(detail, detail[:, A:A + 1], out=detail)
+        row[...] = detail
+
+    radii = gaussian_box_radii(sigma)
+    _separable_box(pixels, radii, radii, target=np.empty_like(pixels), emit=combine)
+
+
+def motion_blur(pixels, radius, angle, chunk=128):
+    """
+    Average along a line of length (2 * radius + 1) at an angle, in place.
+
+    Horizontal and vertical lines use running sums. Other angles sum
+    shifted copies of the edge-padded image, which costs one add per
+    line pixel.
+
+    Args:
+        pixels: (H, W, C) uint8 array
+        radius: Half length of the line in pixels
+        angle: Direction of motion in degrees (0 = horizontal)
+    """
+    if radius <= 0:
+        return
+    angle = angle % 180
+    if angle == 0:
+        _separable_box(pixels, [radius], [])
+        return
+    if angle == 90:
+        _separable_box(pixels, [], [radius])
+        return
+
+    dx = math.cos(math.radians(angle))
+    dy = -math.sin(math.radians(angle))
+    offsets = [(int(round(k * dy)), int(round(k * dx))) for k in range(-radius, radius + 1)]
+    table = _division_table(len(offsets))
+
+    height, width = pixels.shape[:2]
+    padded = np.pad(pixels, ((radius, radius), (radius, radius), (0, 0)), mode='edge')
+    dtype = np.uint16 if len(offsets) * 255 < 65536 else np.uint32
+    total = np.empty((chunk, width, pixels.shape[2]), dtype=dtype)
+    for top in range(0, height, chunk):
+        checkpoint(top / height)
+        rows = min(chunk, height - top)
+        band = total[:rows]
+        band.fill(0)
+        for oy, ox in offsets:
+            y = top + radius + oy
+            x = radius + ox
+            band += padded[y:y + rows, x:x + width]
+        np.take(table, band, out=pixels[top:top + rows])
@@ -4,13 +4,72 @@ Document class that wraps QGraphicsScene and manages command history.
 This is the central state manager for the paint application.
 """
 
-from PyQt5.QtWidgets import QGraphicsScene, QGraphicsPixmapItem
-from PyQt5.QtCore import QRectF
-from PyQt5.QtGui import QImage, QPainter, QPixmap, QColor
+import weakref
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsRectItem, QGraphicsPathItem, QStyleOptionGraphicsItem
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QImage, QPainter, QPixmap, QColor, QPen, QBrush
 from src.core.command_history import CommandHistory
+from src.core.swap_file import SwapFile
+from src.core.filter_cache import FilterCache, FILTER_CACHE_BYTE_BUDGET
+from src.core.composite_cache import CompositeCache
+from src.core.vector_layer import VectorLayer
+from src.core.tiled_canvas_item import TiledCanvasItem
+from src.core.item_registry import ItemRegistry, ItemRole
 from src.core.command import ICommand
 
 
+HISTORY_BYTE_BUDGET = 1024 * 1024 * 1024
+
+
+class DocumentScene(QGraphicsScene):
+    """QGraphicsScene that carries its document's item registry, selection, composite and vector items."""
+    
+    def __init__(self, registry):
+        super().__init__()
+        # Items mostly sit still, so a BSP tree pays off: painting, hit-testing
+        # and rubber-band selection only visit items near the queried area.
+        self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.registry = registry
+        self.selection = None  # Selection restricting filters, or None for the whole canvas
+        self.composite = CompositeCache(self)  # Visible colors, for tools that read pixels
+        self.vectors = VectorLayer(self)  # Live shape/text items and their selection
+    
+    def set_selection(self, selection):
+        """
+        Replace the selection and its outline.
+        
+        Args:
+            selection: Selection, or None to select everything
+        """
+        if selection is not None and selection.is_empty():
+            selection = None
+        self.selection = selection
+        
+        self.show_selection_outline(selection.path if selection is not None else None)
+    
+    def show_selection_outline(self, path):
+        """
+        Show a dashed selection outline, e.g. while a selection is dragged.
+        
+        Args:
+            path: QPainterPath in canvas coordinates, or None to hide the outline
+        """
+        outline = self.registry.get(ItemRole.SELECTION)
+        if path is None:
+            if outline is not None:
+                self.registry.unregister(ItemRole.SELECTION)
+                self.removeItem(outline)
+            return
+        
+        if outline is None:
+            outline = QGraphicsPathItem()
+            outline.setPen(QPen(Qt.black, 0, Qt.DashLine))  # Cosmetic: one screen pixel at any zoom
+            outline.setZValue(1e6)
+            self.registry.register(ItemRole.SELECTION, outline)
+            self.addItem(outline)
+        outline.setPath(path)
+
+
 class Document:
     """
     Document manages the canvas state and command history.
@@ -19,57 +78,150 @@ class Document:
     to ensure they can be undone/redone.
     """
     
-    def __init__(self, width=1920, height=1080):
+    def __init__(self, width=1920, height=1080, history_bytes=HISTORY_BYTE_BUDGET,
+                 filter_cache_bytes=FILTER_CACHE_BYTE_BUDGET):
         """
         Initialize document with scene and command history.
         
         Args:
             width: Canvas width in pixels (default: 1920)
             height: Canvas height in pixels (default: 1080)
+            history_bytes: Memory budget for undo/redo history in bytes
+            filter_cache_bytes: Memory budget for cached filter results in bytes
         """
-        self.scene = QGraphicsScene()
-        self.scene.setSceneRect(0, 0, width, height)
-        self.history = CommandHistory(max_undo=20)
+        self.registry = ItemRegistry()
+        self.scene = DocumentScene(self.registry)
+        self.history = CommandHistory(max_undo=1000, max_bytes=history_bytes,
+                                      swap_file=SwapFile())
+        self.filter_cache = FilterCache(filter_cache_bytes)
+        self.render_time_ms = 0.0  # Smoothed cost of repainting the view
+        self.flatten_budget_ms = 12.0
+        self.min_flatten_items = 32
+        self.flattened_items = []  # Vector items baked into the flattened layer, bottom to top
+        self.scene.vectors.set_flattened_source(lambda: self.flattened_items, self.unflatten)
+        self.revision = 0  # Identifies the current document content
+        self._last_revision = 0
+        self._command_revisions = weakref.WeakKeyDictionary()  # command -> (before, after)
+        
+        self.reset(width, height)
+    
+    @property
+    def canvas_item(self):
+        """The tiled canvas item tools paint into."""
+        return self.registry.get(ItemRole.CANVAS)
+    
+    @property
+    def background_item(self):
+        """The opened image beneath the canvas, or None."""
+        return self.registry.get(ItemRole.BACKGROUND)
+    
+    @property
+    def checkerboard_item(self):
+        """The transparency checkerboard item."""
+        return self.registry.get(ItemRole.CHECKERBOARD)
+    
+    @property
+    def selection(self):
+        """The current Selection, or None when everything is selected."""
+        return self.scene.selection
+    
+    @property
+    def flattened_item(self):
+        """The cached layer holding flattened shape/text items, or None."""
+        return self.registry.get(ItemRole.FLATTENED)
+    
+    def reset(self, width, height, background_image=None):
+        """
+        Replace the scene contents with a fresh canvas and drop all history.
+        
+        Args:
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            background_image: Optional QImage shown beneath the canvas
+        """
+        self.scene.clear()
+        self.registry.clear()
+        self.scene.selection = None
+        self.scene.composite.invalidate()
+        self.scene.vectors.reset()
+        self.flattened_items = []
+        
         self.width = width
         self.height = height
-        self.stroke_count = 0
-        self.flatten_threshold = 50  
-        self.background_pixmap_item = None
+        self.scene.setSceneRect(0, 0, width, height)
         
-        self.canvas_image = QImage(int(width), int(height), QImage.Format_ARGB32)
-        self.canvas_image.fill(0x00000000)  # Transparent background
+        checkerboard_item = self._create_checkerboard_item(int(width), int(height))
+        checkerboard_item.setZValue(-2)  # Behind background and canvas
+        self.registry.register(ItemRole.CHECKERBOARD, checkerboard_item)
+        self.scene.addItem(checkerboard_item)
         
-        checkerboard = self._create_checkerboard(int(width), int(height))
-        self.checkerboard_item = QGraphicsPixmapItem(checkerboard)
-        self.checkerboard_item.setData(0, 'checkerboard')
-        self.checkerboard_item.setZValue(-1)  # Behind canvas
-        self.scene.addItem(self.checkerboard_item)
+        if background_image is not None:
+            background_item = TiledCanvasItem(background_image)
+            background_item.setZValue(-1)
+            self.registry.register(ItemRole.BACKGROUND, background_item)
+            self.scene.addItem(background_item)
         
-        self.canvas_pixmap_item = QGraphicsPixmapItem(QPixmap.fromImage(self.canvas_image))
-        self.canvas_pixmap_item.setData(0, 'canvas')  # Tag for identification
-        self.scene.addItem(self.canvas_pixmap_item)
-    
-    def _create_checkerboard(self, width, height, square_size=16):
-        """Create a checkerboard pattern to show transparency."""
-        checkerboard = QImage(width, height, QImage.Format_RGB32)
-        painter = QPainter(checkerboard)
+        canvas_item = self._create_canvas_item(int(width), int(height))
+        self.registry.register(ItemRole.CANVAS, canvas_item)
+        self.scene.addItem(canvas_item)
         
-        light_gray = QColor(200, 200, 200)
+        self.clear_history()
+        self.filter_cache.clear()
+        self.revision = self._new_revision()
+    
+    def _new_revision(self):
+        self._last_revision += 1
+        return self._last_revision
+    
+    def _create_checkerboard_item(self, width, height, square_size=16):
+        """Create a checkerboard item to show transparency, painted with a tiling brush."""
+        pattern = QPixmap(square_size * 2, square_size * 2)
+        pattern.fill(QColor(200, 200, 200))
+        painter = QPainter(pattern)
         dark_gray = QColor(150, 150, 150)
+        painter.fillRect(square_size, 0, square_size, square_size, dark_gray)
+        painter.fillRect(0, square_size, square_size, square_size, dark_gray)
+        painter.end()
         
-        for y in range(0, height, square_size):
-            for x in range(0, width, square_size):
-                if ((x // square_size) + (y // square_size)) % 2 == 0:
-                    painter.fillRect(x, y, square_size, square_size, light_gray)
-                else:
-                    painter.fillRect(x, y, square_size, square_size, dark_gray)
+        checkerboard_item = QGraphicsRectItem(0, 0, width, height)
+        checkerboard_item.setPen(QPen(Qt.NoPen))
+        checkerboard_item.setBrush(QBrush(pattern))
+        return checkerboard_item
+    
+    def _create_canvas_item(self, width, height):
+        """Create the transparent tiled canvas item that tools paint into."""
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(0x00000000)  # Transparent background
         
-        painter.end()
-        return QPixmap.fromImage(checkerboard)
+        return TiledCanvasItem(image)
     
     def get_canvas_image(self):
-        """Get the current canvas image for pixel-based drawing."""
-        return self.canvas_pixmap_item.pixmap().toImage()
+        """Get the live canvas image for pixel-based drawing."""
+        return self.canvas_item.image()
+    
+    def render_raster(self, rect: QRect, size: QSize = None) -> QImage:
+        """
+        Composite the background and canvas pixels inside a rectangle.
+        
+        Args:
+            rect: Region in canvas coordinates
+            size: Output size; the region is scaled to fit (defaults to rect size)
+        
+        Returns:
+            QImage: ARGB32 premultiplied image of the region
+        """
+        size = size or rect.size()
+        image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(0x00000000)
+        
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, size != rect.size())
+        target = QRectF(0, 0, size.width(), size.height())
+        for item in (self.background_item, self.canvas_item):
+            if item is not None:
+                painter.drawImage(target, item.image(), QRectF(rect))
+        painter.end()
+        return image
     
     def execute_command(self, command: ICommand):
         """
@@ -78,35 +230,97 @@ class Document:
         Args:
             command: The command to execute
         """
+        if self._touches_flattened(command):
+            self.unflatten()
+        before = self.revision
         self.history.execute(command, self.scene)
+        self.revision = self._new_revision()
+        self._command_revisions[command] = (before, self.revision)
         
-        from src.commands.pixel_draw_command import PixelDrawCommand
-        if isinstance(command, PixelDrawCommand):
-            self.stroke_count += 1
-            if self.stroke_count >= self.flatten_threshold:
-                self.flatten_layers()
-                self.stroke_count = 0
+        # Selected objects are being worked on; baking them now would only
+        # have the next hit-test put them back.
+        if self.render_time_ms > self.flatten_budget_ms and not self.scene.vectors.selected:
+            self.flatten_layers()
+    
+    def record_render_time(self, elapsed_ms):
+        """
+        Feed a measured view repaint time into the flatten heuristic.
+        
+        Args:
+            elapsed_ms: Time the last paint of the scene took in milliseconds
+        """
+        self.render_time_ms += 0.2 * (elapsed_ms - self.render_time_ms)
+    
+    def _vector_items(self):
+        """Get live top-level shape/text items, bottom to top."""
+        return self.scene.vectors.items()
+    
+    def _paint_item(self, painter, item, option):
+        """Paint an item and its children with their scene transforms."""
+        if not item.isVisible():
+            return
+        painter.save()
+        painter.setTransform(item.sceneTransform())
+        painter.setOpacity(item.effectiveOpacity())
+        option.exposedRect = item.boundingRect()
+        item.paint(painter, option, None)
+        painter.restore()
+        for child in item.childItems():
+            self._paint_item(painter, child, option)
     
     def flatten_layers(self):
-        """Flatten all scene items into a single background image for performance."""
-        from PyQt5.QtGui import QImage, QPainter, QPixmap
-        from PyQt5.QtWidgets import QGraphicsPixmapItem
+        """
+        Rasterize live shape/text items into a cached layer for performance.
         
-        canvas_rect = QRectF(0, 0, self.width, self.height)
-        image = QImage(int(self.width), int(self.height), QImage.Format_ARGB32)
-        image.fill(0xFFFFFFFF)  
-        painter = QPainter(image)
-        self.scene.render(painter, QRectF(), canvas_rect)
+        The items leave the scene but are remembered, so commands that
+        own them stay undoable: unflatten() re-materialises them.
+        """
+        items = self._vector_items()
+        if len(items) < self.min_flatten_items:
+            return
+        
+        layer = self.flattened_item
+        if layer is None:
+            layer = self._create_canvas_item(int(self.width), int(self.height))
+            self.registry.register(ItemRole.FLATTENED, layer)
+            self.scene.addItem(layer)
+        
+        self.scene.vectors.select([])
+        painter = QPainter(layer.image())
+        painter.setRenderHint(QPainter.Antialiasing)
+        option = QStyleOptionGraphicsItem()
+        for item in items:
+            self._paint_item(painter, item, option)
+            self.scene.removeItem(item)
         painter.end()
         
-        self.scene.clear()
+        layer.mark_dirty(layer.image().rect())
+        self.flattened_items.extend(items)
         
-        pixmap = QPixmap.fromImage(image)
-        self.background_pixmap_item = QGraphicsPixmapItem(pixmap)
-        self.scene.addItem(self.background_pixmap_item)
-        self.history.clear()
+        print(f"[Performance] Flattened {len(items)} items into cached layer "
+              f"(render cost {self.render_time_ms:.1f} ms)")
+    
+    def unflatten(self):
+        """Put every baked item back into the scene, keeping stacking order."""
+        if self.flattened_item is None:
+            return
         
-        print(f"[Performance] Flattened {self.flatten_threshold} strokes into background")
+        live_items = self._vector_items()
+        for item in live_items:
+            self.scene.removeItem(item)
+        
+        self.scene.removeItem(self.registry.unregister(ItemRole.FLATTENED))
+        
+        for item in self.flattened_items + live_items:
+            self.scene.addItem(item)
+        self.flattened_items = []
+        self.scene.composite.invalidate()
+        
+        print("[Performance] Restored flattened items")
+    
+    def _touches_flattened(self, command):
+        """Check if a command operates on items currently baked into the layer."""
+        return any(item in self.flattened_items for item in command.get_scene_items())
     
     def undo(self) -> bool:
         """
@@ -115,7 +329,12 @@ class Document:
         Returns:
             bool: True if undo was performed
         """
-        return self.history.undo(self.scene)
+        if self.history.can_undo() and self._touches_flattened(self.history.undo_stack[-1]):
+            self.unflatten()
+        if not self.history.undo(self.scene):
+            return False
+        self._restore_revision(self.history.redo_stack[-1], 0)
+        return True
     
     def redo(self) -> bool:
         """
@@ -124,7 +343,22 @@ class Document:
         Returns:
             bool: True if redo was performed
         """
-        return self.history.redo(self.scene)
+        if self.history.can_redo() and self._touches_flattened(self.history.redo_stack[-1]):
+            self.unflatten()
+        if not self.history.redo(self.scene):
+            return False
+        self._restore_revision(self.history.undo_stack[-1], 1)
+        return True
+    
+    def _restore_revision(self, command, index):
+        """
+        Return to the revision the document had before/after a command.
+        
+        Undoing back to an earlier state restores its revision, so work
+        keyed on that revision (such as cached filter results) stays valid.
+        """
+        revisions = self._command_revisions.get(command)
+        self.revision = revisions[index] if revisions else self._new_revision()
     
     def can_undo(self) -> bool:
         """Check if undo is available."""
@@ -145,3 +379,7 @@ class Document:
     def clear_history(self):
         """Clear all undo/redo history."""
         self.history.clear()
+    
+    def close(self):
+        """Release history resources, including the undo swap file."""
+        self.history.close()
@@ -0,0 +1,90 @@
+"""
+LRU cache of filter results.
+
+Entries are keyed by (document revision, filter name, parameters, region).
+Document revisions are restored on undo/redo, so re-applying a filter
+after undoing it, or flipping a preview back to settings seen before,
+reuses the stored image instead of filtering again. QImages are
+implicitly shared: handing a cached image out costs nothing, and whoever
+writes to it detaches their own copy first.
+"""
+
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage
+
+
+FILTER_CACHE_BYTE_BUDGET = 256 * 1024 * 1024
+
+
+class FilterCache:
+    """Least-recently-used filter outputs bounded by a byte budget."""
+
+    def __init__(self, max_bytes=FILTER_CACHE_BYTE_BUDGET):
+        """
+        Initialize filter cache.
+
+        Args:
+            max_bytes: Memory budget for cached images in bytes
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()  # key -> QImage, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(revision, filter_name, parameters, region=None):
+        """
+        Build a cache key.
+
+        Args:
+            revision: Document revision the filter input was taken from
+            filter_name: Name of the filter or chain
+            parameters: Hashable tuple of the filter's settings
+            region: Hashable description of the filtered area (None for the whole canvas)
+        """
+        return (revision, filter_name, parameters, region)
+
+    def get(self, key):
+        """
+        Look up a cached result and mark it as recently used.
+
+        Returns:
+            QImage or None on a miss
+        """
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return QImage(image)
+
+    def put(self, key, image):
+        """
+        Store a result, evicting the least recently used ones over budget.
+
+        Images larger than the whole budget are not cached.
+        """
+        size = image.sizeInBytes()
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = QImage(image)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        """Drop every cached result."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        image = self._entries.pop(key, None)
+        if image is not None:
+            self.nbytes -= image.sizeInBytes()
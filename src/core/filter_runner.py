@@ -0,0 +1,219 @@
+"""
+Background execution of filters.
+
+FilterRunner runs filter work on a QThreadPool so the GUI thread keeps
+painting while a slow filter processes a large image. Results, progress
+and errors come back through Qt signals on the GUI thread.
+
+Long-running kernels call checkpoint() between chunks of work. It reports
+progress for the job running on the current thread and raises
+FilterCancelled once the job has been cancelled; outside a job it does
+nothing, so kernels work the same when called directly.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+_context = threading.local()
+
+
+class FilterCancelled(Exception):
+    """Raised inside a filter job that has been cancelled."""
+
+
+def checkpoint(fraction=None):
+    """
+    Report progress of the current job and stop if it was cancelled.
+
+    Args:
+        fraction: Completed part (0..1) of the current progress range
+
+    Raises:
+        FilterCancelled: If the job running on this thread was cancelled
+    """
+    job = getattr(_context, 'job', None)
+    if job is None:
+        return
+    if job.cancelled:
+        raise FilterCancelled()
+    if fraction is not None:
+        low, high = job.progress_range
+        job.report(low + (high - low) * fraction)
+
+
+@contextmanager
+def progress_range(start, end):
+    """
+    Map checkpoint() fractions inside the block to part of the current range.
+
+    Kernels that make several passes wrap each pass so that the overall
+    progress keeps moving forward.
+
+    Args:
+        start: Fraction of the enclosing range where the block starts
+        end: Fraction of the enclosing range where the block ends
+    """
+    job = getattr(_context, 'job', None)
+    if job is None:
+        yield
+        return
+    outer = job.progress_range
+    low, high = outer
+    job.progress_range = (low + (high - low) * start, low + (high - low) * end)
+    try:
+        yield
+    finally:
+        job.progress_range = outer
+
+
+def current_job():
+    """Get the job running on the current thread, or None."""
+    return getattr(_context, 'job', None)
+
+
+class _Helper:
+    """Stands in for a job on a helper thread: cancellation only, no progress."""
+
+    def __init__(self, job):
+        self.job = job
+        self.progress_range = (0.0, 1.0)
+
+    @property
+    def cancelled(self):
+        return self.job.cancelled
+
+    def report(self, fraction):
+        pass
+
+
+@contextmanager
+def helping(job):
+    """
+    Let checkpoint() on a helper thread stop when a job is cancelled.
+
+    Work a job splits across other threads runs inside this block. Only
+    the job's own thread reports progress.
+
+    Args:
+        job: FilterJob being helped, or None outside a job
+    """
+    previous = getattr(_context, 'job', None)
+    _context.job = _Helper(job) if job is not None else None
+    try:
+        yield
+    finally:
+        _context.job = previous
+
+
+class FilterJob:
+    """A unit of filter work and its outcome."""
+
+    def __init__(self, name, func, args, runner):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.progress = 0
+        self.progress_range = (0.0, 1.0)
+        self.data = {}  # Caller state carried to the finished handler
+        self._runner = runner
+
+    def cancel(self):
+        """Ask the job to stop at its next checkpoint."""
+        self.cancelled = True
+
+    def report(self, fraction):
+        """Publish progress, emitting only when the whole percentage changes."""
+        percent = max(0, min(100, int(fraction * 100)))
+        if percent != self.progress:
+            self.progress = percent
+            self._runner.progress.emit(self, percent)
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def run(self):
+        job = self.job
+        runner = job._runner
+        _context.job = job
+        try:
+            checkpoint()
+            job.result = job.func(*job.args)
+            checkpoint(1.0)
+        except FilterCancelled:
+            runner.cancelled.emit(job)
+            return
+        except Exception as error:
+            job.error = error
+            runner.failed.emit(job, str(error))
+            return
+        finally:
+            _context.job = None
+        runner.finished.emit(job)
+
+
+class FilterRunner(QObject):
+    """Runs filter jobs on a thread pool and reports back on the GUI thread."""
+
+    progress = pyqtSignal(object, int)  # job, percent
+    finished = pyqtSignal(object)  # job with .result set
+    failed = pyqtSignal(object, str)  # job, error message
+    cancelled = pyqtSignal(object)  # job
+
+    def __init__(self, max_threads=None, parent=None):
+        """
+        Initialize filter runner.
+
+        Args:
+            max_threads: Worker thread limit (defaults to Qt's ideal count)
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.jobs = []
+
+        for signal in (self.finished, self.failed, self.cancelled):
+            signal.connect(self._forget)
+
+    def submit(self, name, func, *args) -> FilterJob:
+        """
+        Run func(*args) on a worker thread.
+
+        Args:
+            name: Display name of the job
+            func: Callable doing the work; may call checkpoint()
+
+        Returns:
+            FilterJob: Handle for cancellation and caller data
+        """
+        job = FilterJob(name, func, args, self)
+        self.jobs.append(job)
+        self.pool.start(_JobRunnable(job))
+        return job
+
+    def cancel_all(self):
+        """Cancel every queued or running job."""
+        for job in self.jobs:
+            job.cancel()
+
+    def is_busy(self) -> bool:
+        """Check if any job is queued or running."""
+        return bool(self.jobs)
+
+    def wait(self, msecs=-1) -> bool:
+        """Block until all jobs finished; used on shutdown."""
+        return self.pool.waitForDone(msecs)
+
+    def _forget(self, job, *args):
+        if job in self.jobs:
+            self.jobs.remove(job)
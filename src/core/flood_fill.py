@@ -0,0 +1,250 @@
+"""
+Scanline flood fill over pixel arrays.
+
+Matching pixels are found with a vectorized color-distance test and turned
+into horizontal runs, a band of rows at a time and only for the bands the
+fill reaches. The contiguous fill then walks from run to overlapping run
+in the rows above and below, so Python work is per run, never per pixel,
+and no recursion is involved. Runs are painted with one slice assignment
+each.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+from src.core.pixel_buffer import row_chunks
+
+
+BAND_ROWS = 64
+
+
+def tolerance_to_distance(tolerance):
+    """
+    Map a 0..100 tolerance to the largest allowed per-channel difference.
+
+    Args:
+        tolerance: Tolerance percentage
+
+    Returns:
+        int: Channel difference 0..255
+    """
+    return int(round(max(0, min(100, tolerance)) * 255 / 100))
+
+
+class ColorMatcher:
+    """
+    Tests which pixels are within a distance of a color.
+
+    The distance is the largest difference over the channels, alpha
+    included, so tolerance behaves the same on every channel. A matcher
+    is reused for every band of an image: its temporaries are allocated
+    once, which matters as much as the arithmetic at these sizes.
+    """
+
+    def __init__(self, color, distance, width, rows=BAND_ROWS):
+        """
+        Initialize color matcher.
+
+        Args:
+            color: Reference pixel as 4 bytes in the array's channel order
+            distance: Largest allowed difference per channel (0..255)
+            width: Width of the pixel arrays that will be tested
+            rows: Most rows tested at once
+        """
+        color = np.asarray(color, dtype=np.uint8)
+        self.distance = distance
+        self.packed_color = color.view(np.uint32)[0]
+        low = np.maximum(color.astype(np.int16) - distance, 0)
+        span = np.minimum(color.astype(np.int16) + distance, 255) - low
+        # The per-channel bounds are tiled along a whole row so NumPy runs
+        # long inner loops instead of 4-element ones.
+        self.low = np.tile(low.astype(np.uint8), width)
+        self.span = np.tile(span.astype(np.uint8), width)
+        self.scratch = np.empty((rows, width * 4), dtype=np.uint8)
+        self.mask = np.empty((rows, width), dtype=bool)
+
+    def __call__(self, pixels):
+        """
+        Test an (H, W, 4) uint8 array of at most `rows` rows.
+
+        Returns:
+            np.ndarray: (H, W) bool mask, overwritten by the next call
+        """
+        pixels = np.ascontiguousarray(pixels)
+        height, width = pixels.shape[:2]
+        mask = self.mask[:height]
+        if self.distance == 0:
+            return np.equal(pixels.view(np.uint32)[..., 0], self.packed_color, out=mask)
+
+        # Shifting by the low bound wraps everything below it past the high
+        # bound, so one unsigned comparison checks both ends of the range.
+        shifted = np.subtract(pixels.reshape(height, width * 4), self.low, out=self.scratch[:height])
+        np.less_equal(shifted, self.span, out=shifted.view(bool))
+        return np.equal(shifted.view(np.uint32), 0x01010101, out=mask)
+
+
+def color_match(pixels, color, distance):
+    """
+    Test which pixels are within a distance of a color.
+
+    Args:
+        pixels: (H, W, 4) uint8 array
+        color: Reference pixel as 4 bytes in the array's channel order
+        distance: Largest allowed difference per channel (0..255)
+
+    Returns:
+        np.ndarray: (H, W) bool mask
+    """
+    return ColorMatcher(color, distance, pixels.shape[1], pixels.shape[0])(pixels)
+
+
+def _runs(mask):
+    """
+    Split each row of a mask into runs of True pixels.
+
+    Returns:
+        list: Per row, a (starts, ends) pair of lists; ends are exclusive
+    """
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=bool)
+    padded[:, 1:-1] = mask
+    edges = np.flatnonzero(padded[:, 1:] != padded[:, :-1])
+    rows, columns = np.divmod(edges, width + 1)
+    starts = columns[0::2].tolist()
+    ends = columns[1::2].tolist()
+    bounds = np.searchsorted(rows[0::2], np.arange(height + 1)).tolist()
+    return [(starts[bounds[y]:bounds[y + 1]], ends[bounds[y]:bounds[y + 1]])
+            for y in range(height)]
+
+
+class _RunTable:
+    """Runs of matching pixels, computed lazily a band of rows at a time."""
+
+    def __init__(self, pixels, color, distance):
+        self.pixels = pixels
+        self.match = ColorMatcher(color, distance, pixels.shape[1])
+        self.rows = [None] * pixels.shape[0]
+
+    def row(self, y):
+        if self.rows[y] is None:
+            top = y - y % BAND_ROWS
+            band = slice(top, min(top + BAND_ROWS, len(self.rows)))
+            self.rows[band] = _runs(self.match(self.pixels[band]))
+        return self.rows[y]
+
+
+def contiguous_runs(pixels, x, y, distance):
+    """
+    Find the 4-connected region of similar color around a seed pixel.
+
+    Args:
+        pixels: (H, W, 4) uint8 array to test colors on
+        x: Seed column
+        y: Seed row
+        distance: Largest allowed per-channel difference from the seed color
+
+    Returns:
+        list: (row, start, end) runs of the region, ends exclusive
+    """
+    table = _RunTable(pixels, pixels[y, x].copy(), distance)
+    height = pixels.shape[0]
+
+    starts, ends = table.row(y)
+    seed = bisect_right(ends, x)
+    visited = {(y, seed)}
+    stack = [(y, seed)]
+    runs = []
+    while stack:
+        row, index = stack.pop()
+        starts, ends = table.row(row)
+        start, end = starts[index], ends[index]
+        runs.append((row, start, end))
+
+        for next_row in (row - 1, row + 1):
+            if not 0 <= next_row < height:
+                continue
+            next_starts, next_ends = table.row(next_row)
+            # Runs overlapping [start, end): the first one ending after start
+            # onwards, until one begins at or after end.
+            j = bisect_right(next_ends, start)
+            while j < len(next_starts) and next_starts[j] < end:
+                if (next_row, j) not in visited:
+                    visited.add((next_row, j))
+                    stack.append((next_row, j))
+                j += 1
+    return runs
+
+
+def _packed(pixels):
+    """View 4-byte pixels as one uint32 each."""
+    return pixels.view(np.uint32)[..., 0]
+
+
+def _packed_value(value):
+    return np.asarray(value, dtype=np.uint8).view(np.uint32)[0]
+
+
+def runs_bounds(runs):
+    """
+    Get the bounding box of runs.
+
+    Returns:
+        tuple: (left, top, right, bottom) with right/bottom exclusive
+    """
+    rows = [run[0] for run in runs]
+    return (min(run[1] for run in runs), min(rows),
+            max(run[2] for run in runs), max(rows) + 1)
+
+
+def paint_runs(pixels, runs, value, origin=(0, 0)):
+    """
+    Set every pixel of the runs to one value.
+
+    Args:
+        pixels: (H, W, 4) uint8 array
+        runs: (row, start, end) runs
+        value: Pixel as 4 bytes in the array's channel order
+        origin: (x, y) of the array's top-left corner in run coordinates
+    """
+    packed = _packed(pixels)
+    value = _packed_value(value)
+    left, top = origin
+    for row, start, end in runs:
+        packed[row - top, start - left:end - left] = value
+
+
+def global_fill(pixels, sample, color, distance, value):
+    """
+    Set every pixel of similar color to one value, connected or not.
+
+    Args:
+        pixels: (H, W, 4) uint8 array to paint
+        sample: (H, W, 4) uint8 array to test colors on (may be pixels)
+        color: Reference pixel in the sample's channel order
+        distance: Largest allowed per-channel difference
+        value: Fill pixel in the array's channel order
+
+    Returns:
+        tuple or None: (left, top, right, bottom) of the changed area
+    """
+    packed = _packed(pixels)
+    value = _packed_value(value)
+    match = ColorMatcher(color, distance, pixels.shape[1])
+    columns = np.zeros(pixels.shape[1], dtype=bool)
+    top = bottom = None
+    for band in row_chunks(pixels.shape[0], BAND_ROWS):
+        mask = match(sample[band])
+        hit_rows = np.flatnonzero(mask.any(axis=1))
+        if not len(hit_rows):
+            continue
+        np.logical_or(columns, mask.any(axis=0), out=columns)
+        if top is None:
+            top = band.start + hit_rows[0]
+        bottom = band.start + hit_rows[-1] + 1
+        np.copyto(packed[band], value, where=mask)
+
+    if top is None:
+        return None
+    hit_columns = np.flatnonzero(columns)
+    return int(hit_columns[0]), int(top), int(hit_columns[-1]) + 1, int(bottom)
@@ -0,0 +1,126 @@
+"""
+Image snapshots for undo/redo payloads.
+
+An ImageSnapshot wraps a QImage kept by a command. Cold snapshots can be
+compressed and then spilled to a SwapFile (safely from a background
+thread); they are paged back in and decompressed lazily the next time the
+command needs the pixels.
+"""
+
+import threading
+import zlib
+
+from PyQt5.QtGui import QImage
+
+
+class ImageSnapshot:
+    """A QImage that can be compressed or spilled and restored on demand."""
+
+    def __init__(self, image: QImage):
+        """
+        Initialize snapshot.
+
+        Args:
+            image: Image to keep; it must not be painted on afterwards
+        """
+        self._lock = threading.Lock()
+        self._image = image
+        self._compressed = None
+        self._swap = None  # (swap_file, offset, length) while spilled
+        self._discarded = False
+        self._width = image.width()
+        self._height = image.height()
+        self._format = image.format()
+        self._bytes_per_line = image.bytesPerLine()
+
+    def image(self) -> QImage:
+        """
+        Get the snapshot image, paging it in and decompressing it if needed.
+
+        Returns:
+            QImage: The stored pixels
+        """
+        with self._lock:
+            if self._image is None:
+                if self._swap is not None:
+                    swap_file, offset, length = self._swap
+                    self._compressed = swap_file.read(offset, length)
+                    swap_file.release(offset, length)
+                    self._swap = None
+                data = zlib.decompress(self._compressed)
+                self._image = QImage(data, self._width, self._height,
+                                     self._bytes_per_line, self._format).copy()
+                self._compressed = None
+            return self._image
+
+    def compress(self, level: int = 1):
+        """
+        Replace the raw pixels with a zlib-compressed copy.
+
+        Safe to call from a worker thread: the heavy work runs outside the
+        lock and the result is dropped if the image was touched meanwhile.
+
+        Args:
+            level: zlib compression level (1 favours speed)
+        """
+        with self._lock:
+            image = self._image
+        if image is None:
+            return
+
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        compressed = zlib.compress(bits, level)
+
+        with self._lock:
+            if self._image is image:
+                self._compressed = compressed
+                self._image = None
+
+    def spill(self, swap_file):
+        """
+        Move the compressed pixels out of RAM into a swap file.
+
+        Args:
+            swap_file: SwapFile that will hold the data
+        """
+        self.compress()
+        with self._lock:
+            compressed = self._compressed
+        if compressed is None:
+            return
+
+        offset, length = swap_file.write(compressed)
+
+        with self._lock:
+            if self._compressed is compressed and not self._discarded:
+                self._swap = (swap_file, offset, length)
+                self._compressed = None
+                return
+        swap_file.release(offset, length)
+
+    def discard(self):
+        """Release any swap file space; call when the owning command is dropped."""
+        with self._lock:
+            self._discarded = True
+            if self._swap is not None:
+                swap_file, offset, length = self._swap
+                swap_file.release(offset, length)
+                self._swap = None
+
+    def is_compressed(self) -> bool:
+        """Check if the snapshot is compressed in memory or spilled."""
+        return self._image is None
+
+    def is_spilled(self) -> bool:
+        """Check if the snapshot currently lives in a swap file."""
+        return self._swap is not None
+
+    def nbytes(self) -> int:
+        """Get the number of bytes of RAM the snapshot currently occupies."""
+        with self._lock:
+            if self._image is not None:
+                return self._image.sizeInBytes()
+            if self._compressed is not None:
+                return len(self._compressed)
+            return 0
@@ -0,0 +1,59 @@
+"""
+Registry of a document's special scene items.
+
+Commands and tools look up the canvas, background and other layers here
+instead of scanning scene.items() for tagged items.
+"""
+
+from enum import Enum
+
+
+class ItemRole(Enum):
+    """Roles of the special items a document keeps in its scene."""
+
+    CHECKERBOARD = 'checkerboard'
+    BACKGROUND = 'background'
+    CANVAS = 'canvas'
+    FLATTENED = 'flattened'
+    SELECTION = 'selection'
+    SHAPE_PREVIEW = 'shape_preview'
+    OBJECT_SELECTION = 'object_selection'
+    TEXT_EDIT = 'text_edit'
+
+
+class ItemRegistry:
+    """Maps ItemRole values to the scene items that currently fill them."""
+
+    def __init__(self):
+        self._items = {}
+
+    def register(self, role: ItemRole, item):
+        """
+        Register an item for a role, replacing any previous one.
+
+        The role is also stored as the item's data(0) tag so the item can
+        be told apart from regular shape/text items.
+
+        Args:
+            role: Role the item fills
+            item: QGraphicsItem for the role
+        """
+        item.setData(0, role.value)
+        self._items[role] = item
+
+    def unregister(self, role: ItemRole):
+        """
+        Forget the item registered for a role.
+
+        Returns:
+            The removed item or None
+        """
+        return self._items.pop(role, None)
+
+    def get(self, role: ItemRole):
+        """Get the item registered for a role, or None."""
+        return self._items.get(role)
+
+    def clear(self):
+        """Forget all registered items."""
+        self._items.clear()
@@ -0,0 +1,132 @@
+"""
+Zero-copy NumPy access to QImage pixels.
+
+view() exposes a 32-bit QImage's pixel memory as a writable (H, W, 4)
+uint8 array that honours the image's stride; index the last axis with the
+B, G, R, A byte offsets, which follow the platform's byte order. The array
+keeps the QImage alive, so it can never point at freed memory.
+
+from_array() goes the other way and wraps an array in a QImage that
+shares its memory.
+
+Filters and fill tools should build on these instead of pixel()/setPixel()
+loops.
+"""
+
+import sys
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtGui import QImage
+
+
+# Byte offsets of the channels inside a 32-bit pixel as laid out in memory.
+if sys.byteorder == 'little':
+    B, G, R, A = 0, 1, 2, 3
+else:
+    A, R, G, B = 0, 1, 2, 3
+
+SUPPORTED_FORMATS = (
+    QImage.Format_RGB32,
+    QImage.Format_ARGB32,
+    QImage.Format_ARGB32_Premultiplied,
+)
+
+
+class _ImageBuffer:
+    """Array-interface provider that holds a reference to its QImage."""
+
+    def __init__(self, image: QImage, writable: bool, channels: int):
+        self.image = image
+        bits = image.bits() if writable else image.constBits()
+        shape = (image.height(), image.width())
+        strides = (image.bytesPerLine(), channels)
+        if channels > 1:
+            shape += (channels,)
+            strides += (1,)
+        self.__array_interface__ = {
+            'version': 3,
+            'shape': shape,
+            'typestr': '|u1',
+            'strides': strides,
+            'data': (int(bits), not writable),
+        }
+
+
+def view(image: QImage, writable: bool = True) -> np.ndarray:
+    """
+    Get an (H, W, 4) uint8 array over a QImage's pixels without copying.
+
+    Requesting a writable view detaches the image from any implicitly
+    shared copies first, so writes never leak into other QImages. Do not
+    make shallow QImage copies of the image while writing through the view.
+
+    Args:
+        image: QImage in RGB32, ARGB32 or ARGB32_Premultiplied format
+        writable: Whether the array may be written to
+
+    Returns:
+        np.ndarray: View of the pixel memory in byte order B, G, R, A offsets
+
+    Raises:
+        ValueError: If the image is not in a supported 32-bit format
+    """
+    if image.format() not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported QImage format for pixel view: {image.format()}")
+    return np.asarray(_ImageBuffer(image, writable, 4))
+
+
+def view_gray8(image: QImage, writable: bool = True) -> np.ndarray:
+    """
+    Get an (H, W) uint8 array over a Format_Grayscale8/Alpha8 QImage.
+
+    Args:
+        image: 8-bit QImage
+        writable: Whether the array may be written to
+
+    Returns:
+        np.ndarray: View of the pixel memory
+    """
+    if image.format() not in (QImage.Format_Grayscale8, QImage.Format_Alpha8):
+        raise ValueError(f"Unsupported QImage format for 8-bit view: {image.format()}")
+    return np.asarray(_ImageBuffer(image, writable, 1))
+
+
+def from_array(array: np.ndarray, image_format=QImage.Format_ARGB32) -> QImage:
+    """
+    Wrap an (H, W, 4) uint8 array in a QImage that shares its memory.
+
+    The returned QImage holds a reference to the array. Call .copy() on it
+    before handing it to code that may outlive the Python wrapper.
+
+    Args:
+        array: Pixel data in memory byte order; rows may be padded
+        image_format: 32-bit QImage format describing the data
+
+    Returns:
+        QImage: Image backed by the array's memory
+    """
+    if array.dtype != np.uint8 or array.ndim != 3 or array.shape[2] != 4:
+        raise ValueError("Expected an (H, W, 4) uint8 array")
+    if array.strides[1] != 4 or array.strides[2] != 1 or array.strides[0] % 4:
+        array = np.ascontiguousarray(array)
+
+    height, width = array.shape[:2]
+    image = QImage(sip.voidptr(array.ctypes.data), width, height, array.strides[0], image_format)
+    image._pixel_buffer = array
+    return image
+
+
+def row_chunks(height: int, rows: int = 256):
+    """
+    Split an image height into row slices for bounded temporary memory.
+
+    Args:
+        height: Number of rows
+        rows: Rows per chunk
+
+    Yields:
+        slice: Row range of each chunk
+    """
+    for top in range(0, height, rows):
+        yield slice(top, min(top + rows, height))
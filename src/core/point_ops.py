@@ -0,0 +1,289 @@
+"""
+Point operations on 32-bit pixel buffers.
+
+A point operation maps every channel value independently of its
+neighbours, so it can be expressed as a 256-entry lookup table per
+channel. apply_luts() pairs neighbouring channels into 16-bit indices and
+looks both up at once, which halves the number of gathers over the buffer.
+
+Operations that mix channels (hue rotation, saturation) are affine color
+transforms instead; apply_color_matrix() evaluates them in integer fixed
+point, one row chunk at a time.
+
+Grayscale conversion computes one gray level per pixel and writes it to
+all color channels, or into a separate 8-bit image with to_grayscale8().
+
+PointOperation chains any of these so that a sequence of adjustments walks
+the image once, with every stage applied to a row chunk while it is hot.
+"""
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from src.core.pixel_buffer import B, G, R, A, row_chunks, view, view_gray8
+from src.core.filter_runner import checkpoint
+
+
+IDENTITY = np.arange(256, dtype=np.uint8)
+
+
+def _pair_table(low, high):
+    """Build a 65536-entry table that maps two channels packed in a uint16."""
+    index = np.arange(65536, dtype=np.uint32)
+    return (low[index & 0xFF].astype(np.uint16)
+            | (high[index >> 8].astype(np.uint16) << 8)).astype('<u2')
+
+
+class _LutStage:
+    """
+    Per-channel lookup tables, indexed by byte offset within a pixel.
+
+    The paired tables are built once, up front, and never change, so one
+    stage can be applied from several tile threads at the same time.
+    """
+
+    def __init__(self, luts):
+        self.luts = luts
+        # Channel pairs whose tables are both the identity are skipped.
+        tables = []
+        for index in range(2):
+            low, high = luts[2 * index], luts[2 * index + 1]
+            if low is not IDENTITY or high is not IDENTITY:
+                table = _pair_table(low, high)
+                table.flags.writeable = False
+                tables.append((index, table))
+        self._tables = tuple(tables)
+
+    def then(self, other):
+        """Compose with a following LUT stage into one table per channel."""
+        return _LutStage([second[first] if second is not IDENTITY else first
+                          for first, second in zip(self.luts, other.luts)])
+
+    def apply(self, block):
+        pairs = block.view('<u2')
+        for index, table in self._tables:
+            pairs[..., index] = np.take(table, pairs[..., index])
+
+
+MATRIX_SHIFT = 12  # Fixed-point precision of color matrix weights
+
+
+class _MatrixStage:
+    """Affine RGB transform in integer fixed point."""
+
+    def __init__(self, matrix, offset):
+        scale = 1 << MATRIX_SHIFT
+        self.weights = np.rint(np.asarray(matrix, dtype=np.float64) * scale).astype(np.int32)
+        self.bias = np.rint(np.asarray(offset, dtype=np.float64) * scale).astype(np.int32) + scale // 2
+
+    def apply(self, block):
+        inputs = [block[..., R].astype(np.int32), block[..., G].astype(np.int32),
+                  block[..., B].astype(np.int32)]
+        result = np.empty_like(inputs[0])
+        for row, channel in enumerate((R, G, B)):
+            np.multiply(inputs[0], self.weights[row, 0], out=result)
+            result += inputs[1] * self.weights[row, 1]
+            result += inputs[2] * self.weights[row, 2]
+            result += self.bias[row]
+            result >>= MATRIX_SHIFT
+            np.clip(result, 0, 255, out=result)
+            block[..., channel] = result
+
+
+class _GrayStage:
+    """Replace the color channels with a gray level."""
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def apply(self, block):
+        gray = gray_levels(block, self.mode)
+        block[..., R] = gray
+        block[..., G] = gray
+        block[..., B] = gray
+
+
+class PointOperation:
+    """
+    A chain of point operations applied in a single pass over a buffer.
+
+    Stages run one after another on each row chunk while it is still in
+    cache, instead of each walking the whole image. Consecutive lookup
+    table stages are composed into one table per channel when chained.
+    """
+
+    def __init__(self, stages=()):
+        self.stages = list(stages)
+
+    @classmethod
+    def from_luts(cls, red=None, green=None, blue=None, alpha=None):
+        """
+        Create an operation from per-channel lookup tables.
+
+        Args:
+            red, green, blue, alpha: 256-entry uint8 tables (None keeps the channel)
+        """
+        luts = [IDENTITY] * 4
+        for offset, lut in ((R, red), (G, green), (B, blue), (A, alpha)):
+            if lut is not None:
+                luts[offset] = np.asarray(lut, dtype=np.uint8)
+        return cls([_LutStage(luts)])
+
+    @classmethod
+    def from_color_matrix(cls, matrix, offset=(0, 0, 0)):
+        """
+        Create an operation from an affine RGB transform.
+
+        Each output channel is a weighted sum of the input red, green and
+        blue values plus an offset. Alpha is kept.
+
+        Args:
+            matrix: 3x3 weights; rows produce red, green, blue from (r, g, b)
+            offset: Value added to each output channel (0..255 scale)
+        """
+        return cls([_MatrixStage(matrix, offset)])
+
+    @classmethod
+    def from_grayscale(cls, mode='rec601'):
+        """
+        Create an operation that converts colors to gray.
+
+        Args:
+            mode: One of GRAY_MODES
+        """
+        return cls([_GrayStage(mode)])
+
+    def then(self, other):
+        """
+        Chain another operation after this one.
+
+        Returns:
+            PointOperation: Combined operation
+        """
+        stages = list(self.stages)
+        for stage in other.stages:
+            if stages and isinstance(stage, _LutStage) and isinstance(stages[-1], _LutStage):
+                stages[-1] = stages[-1].then(stage)
+            else:
+                stages.append(stage)
+        return PointOperation(stages)
+
+    def apply(self, pixels, rows=128):
+        """
+        Run every stage over an (H, W, 4) uint8 buffer in place.
+
+        Color stages expect unpremultiplied pixels, except grayscale which
+        also works on premultiplied ones.
+
+        Args:
+            pixels: Array from pixel_buffer.view()
+            rows: Rows processed per chunk
+        """
+        if not self.stages:
+            return
+        for chunk in row_chunks(pixels.shape[0], rows):
+            checkpoint(chunk.start / pixels.shape[0])
+            block = pixels[chunk]
+            for stage in self.stages:
+                stage.apply(block)
+
+
+def apply_luts(pixels, red=None, green=None, blue=None, alpha=None, rows=256):
+    """
+    Map the channels of an (H, W, 4) uint8 buffer through lookup tables in place.
+
+    Args:
+        pixels: Array from pixel_buffer.view(); rows must be contiguous
+        red, green, blue, alpha: 256-entry uint8 tables (None keeps the channel)
+        rows: Rows processed per chunk
+    """
+    PointOperation.from_luts(red, green, blue, alpha).apply(pixels, rows)
+
+
+def apply_color_matrix(pixels, matrix, offset=(0, 0, 0), rows=128):
+    """
+    Transform the RGB channels of an (H, W, 4) uint8 buffer in place.
+
+    Args:
+        pixels: Array from pixel_buffer.view()
+        matrix: 3x3 weights; rows produce red, green, blue from (r, g, b)
+        offset: Value added to each output channel (0..255 scale)
+        rows: Rows processed per chunk
+    """
+    PointOperation.from_color_matrix(matrix, offset).apply(pixels, rows)
+
+
+# Fixed-point (16-bit) red, green, blue weights of each grayscale mode.
+GRAY_WEIGHTS = {
+    'rec601': (19595, 38470, 7471),
+    'rec709': (13933, 46871, 4732),
+    'average': (21845, 21846, 21845),
+}
+GRAY_MODES = ('rec601', 'rec709', 'average', 'desaturate')
+
+
+def gray_levels(block, mode='rec601'):
+    """
+    Compute the gray level of every pixel in a chunk.
+
+    All modes are homogeneous in the color channels, so premultiplied
+    pixels give premultiplied gray levels.
+
+    Args:
+        block: (rows, W, 4) uint8 pixel chunk
+        mode: One of GRAY_MODES
+
+    Returns:
+        np.ndarray: (rows, W) uint8 gray levels
+    """
+    red, green, blue = block[..., R], block[..., G], block[..., B]
+    if mode == 'desaturate':
+        high = np.maximum(np.maximum(red, green), blue).astype(np.uint16)
+        high += np.minimum(np.minimum(red, green), blue)
+        high += 1
+        high >>= 1
+        return high.astype(np.uint8)
+
+    wr, wg, wb = GRAY_WEIGHTS[mode]
+    total = np.multiply(red, wr, dtype=np.int32)
+    total += np.multiply(green, wg, dtype=np.int32)
+    total += np.multiply(blue, wb, dtype=np.int32)
+    total += 1 << 15
+    total >>= 16
+    return total.astype(np.uint8)
+
+
+def grayscale(pixels, mode='rec601', rows=256):
+    """
+    Replace the color channels of an (H, W, 4) buffer with gray in place.
+
+    Args:
+        pixels: Array from pixel_buffer.view()
+        mode: One of GRAY_MODES
+        rows: Rows processed per chunk
+    """
+    PointOperation.from_grayscale(mode).apply(pixels, rows)
+
+
+def to_grayscale8(image: QImage, mode='rec601', rows=256) -> QImage:
+    """
+    Convert a 32-bit image to a Format_Grayscale8 image.
+
+    The gray image is the only full-size allocation. Premultiplied input
+    yields its colors composited over black, since the result has no alpha.
+
+    Args:
+        image: QImage in one of pixel_buffer.SUPPORTED_FORMATS
+        mode: One of GRAY_MODES
+        rows: Rows processed per chunk
+
+    Returns:
+        QImage: 8-bit grayscale image of the same size
+    """
+    pixels = view(image, writable=False)
+    result = QImage(image.width(), image.height(), QImage.Format_Grayscale8)
+    gray = view_gray8(result)
+    for chunk in row_chunks(pixels.shape[0], rows):
+        checkpoint(chunk.start / pixels.shape[0])
+        gray[chunk] = gray_levels(pixels[chunk], mode)
+    return result
@@ -0,0 +1,77 @@
+"""
+Pixel selections.
+
+A Selection is an antialiased coverage mask over its bounding box. Filters
+use the box to decide how much of the image to process and the mask to
+blend the filtered pixels back in, so the work done is proportional to
+the selected area rather than to the whole image.
+"""
+
+import itertools
+
+import numpy as np
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter, QPainterPath
+
+from src.core import pixel_buffer
+
+
+_serials = itertools.count(1)
+
+
+class Selection:
+    """An immutable selection mask with its bounding box in canvas pixels."""
+
+    def __init__(self, path: QPainterPath, bounds: QRect):
+        """
+        Rasterize a selection outline.
+
+        Args:
+            path: Outline in canvas coordinates
+            bounds: Canvas rectangle the selection is clipped to
+        """
+        self.path = QPainterPath(path)
+        self.rect = path.boundingRect().toAlignedRect().intersected(bounds)
+        self.serial = next(_serials)  # Identifies this selection in cache keys
+
+        self.mask = QImage(self.rect.size(), QImage.Format_Grayscale8)
+        self.mask.fill(0)
+        if not self.rect.isEmpty():
+            painter = QPainter(self.mask)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.translate(-self.rect.topLeft())
+            painter.fillPath(path, Qt.white)
+            painter.end()
+
+    def is_empty(self) -> bool:
+        return self.rect.isEmpty()
+
+    def coverage(self) -> np.ndarray:
+        """Get the (H, W) uint8 coverage of the bounding box, 255 = fully selected."""
+        return pixel_buffer.view_gray8(self.mask, writable=False)
+
+    def blend(self, filtered: QImage, original: QImage) -> QImage:
+        """
+        Mix filtered pixels into the original through the selection mask.
+
+        Both images cover the bounding box and are blended in premultiplied
+        form, so partially covered edge pixels fade smoothly.
+
+        Args:
+            filtered: Filter result for the bounding box
+            original: Unfiltered pixels of the bounding box
+
+        Returns:
+            QImage: ARGB32 premultiplied blend
+        """
+        result = original.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        filtered = filtered.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        pixels = pixel_buffer.view(result)
+        weight = self.coverage()[..., None].astype(np.uint16)
+        mixed = pixel_buffer.view(filtered, writable=False) * weight
+        mixed += pixels * (255 - weight)
+        mixed += 127
+        mixed //= 255
+        pixels[...] = mixed
+        return result
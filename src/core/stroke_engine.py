@@ -0,0 +1,179 @@
+"""
+Stroke engine shared by the brush and eraser tools.
+
+A StrokeEngine owns one QPainter on the canvas image for the whole
+press->release lifetime of a stroke. Each segment is painted straight
+into the canvas and only its bounding rect is invalidated. Tiles are
+backed up the first time a stroke touches them, so the undo patch is
+assembled without ever copying the full canvas.
+
+Input points are treated as Catmull-Rom control points: the curve between
+them is resampled at a fixed dab spacing, so fast strokes stay smooth and
+the work per batch depends on stroke length, not on the mouse's event rate.
+"""
+
+import math
+
+from PyQt5.QtCore import QRect, QPointF, QLineF
+from PyQt5.QtGui import QPainter, QPen, QPolygonF
+
+
+def _catmull_rom(p0, p1, p2, p3, t):
+    """Evaluate a uniform Catmull-Rom segment between p1 and p2 at t in [0, 1]."""
+    t2 = t * t
+    t3 = t2 * t
+    return 0.5 * ((2 * p1) + (p2 - p0) * t
+                  + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
+                  + (3 * p1 - p0 - 3 * p2 + p3) * t3)
+
+
+class StrokeEngine:
+    """Paints a single stroke into a TiledCanvasItem."""
+
+    def __init__(self):
+        self.canvas_item = None
+        self._painter = None
+        self._pad = 0.0
+        self._spacing = 1.0
+        self._last_pos = None  # Last point actually painted
+        self._controls = []  # Recent control points not fully painted yet
+        self._travel = 0.0  # Distance covered since the last dab
+        self._backup = {}  # (column, row) -> QImage of the tile before the stroke
+        self.dirty_rect = QRect()
+
+    def is_active(self) -> bool:
+        """Check if a stroke is in progress."""
+        return self._painter is not None
+
+    def begin(self, canvas_item, start_pos, pen: QPen, opacity: float = 1.0,
+              composition_mode=QPainter.CompositionMode_SourceOver, spacing_ratio=0.25):
+        """
+        Start a stroke.
+
+        Args:
+            canvas_item: TiledCanvasItem to paint into
+            start_pos: Scene position where the stroke starts
+            pen: Pen used for every segment
+            opacity: Painter opacity for the stroke
+            composition_mode: QPainter composition mode (e.g. Clear for erasing)
+            spacing_ratio: Dab spacing as a fraction of the pen width
+        """
+        self.canvas_item = canvas_item
+        self._backup = {}
+        self.dirty_rect = QRect()
+        self._last_pos = QPointF(start_pos)
+        self._controls = [QPointF(start_pos), QPointF(start_pos)]
+        self._travel = 0.0
+        self._pad = pen.widthF() / 2.0 + 2
+        self._spacing = max(1.0, pen.widthF() * spacing_ratio)
+
+        self._painter = QPainter(canvas_item.image())
+        self._painter.setRenderHint(QPainter.Antialiasing)
+        self._painter.setCompositionMode(composition_mode)
+        self._painter.setPen(pen)
+        self._painter.setOpacity(opacity)
+
+    def add_points(self, points):
+        """
+        Extend the stroke through new input points and paint the result.
+
+        The curve up to the second-to-last control point is painted in one
+        polyline; the last piece waits for the next point (or end()).
+
+        Args:
+            points: Scene positions in input order
+        """
+        if self._painter is None:
+            return
+
+        dabs = []
+        for pos in points:
+            self._controls.append(QPointF(pos))
+            if len(self._controls) == 4:
+                self._resample(*self._controls, dabs)
+                self._controls.pop(0)
+        self._paint(dabs)
+
+    def _resample(self, p0, p1, p2, p3, dabs):
+        """Append points spaced evenly along the curve from p1 to p2."""
+        spacing = self._spacing
+        steps = max(1, int(math.ceil(QLineF(p1, p2).length() * 4 / spacing)))
+        previous = p1
+        for step in range(1, steps + 1):
+            point = _catmull_rom(p0, p1, p2, p3, step / steps)
+            distance = QLineF(previous, point).length()
+            while distance > 0 and self._travel + distance >= spacing:
+                previous = previous + (point - previous) * ((spacing - self._travel) / distance)
+                dabs.append(previous)
+                distance = QLineF(previous, point).length()
+                self._travel = 0.0
+            self._travel += distance
+            previous = point
+
+    def _paint(self, dabs):
+        """Paint a polyline from the last painted point through the dabs."""
+        if not dabs:
+            return
+
+        polyline = QPolygonF([self._last_pos] + dabs)
+        pad = self._pad
+        rect = polyline.boundingRect().adjusted(-pad, -pad, pad, pad).toAlignedRect()
+        rect = rect.intersected(self.canvas_item.image().rect())
+
+        if not rect.isEmpty():
+            self._backup_tiles(rect)
+            self._painter.drawPolyline(polyline)
+            self.dirty_rect = self.dirty_rect.united(rect)
+            self.canvas_item.mark_dirty(rect)
+
+        self._last_pos = dabs[-1]
+
+    def _backup_tiles(self, rect: QRect):
+        """Copy tiles the stroke is about to touch for the first time."""
+        image = self.canvas_item.image()
+        for key in self.canvas_item.tiles_in(rect):
+            if key not in self._backup:
+                self._backup[key] = image.copy(self.canvas_item.tile_rect(*key))
+
+    def end(self):
+        """
+        Finish the stroke.
+
+        Returns:
+            tuple: (rect, before_patch, after_patch) or None if nothing was painted
+        """
+        if self._painter is None:
+            return None
+
+        # Close the curve on the last input point.
+        end_pos = self._controls[-1]
+        dabs = []
+        self._controls.append(end_pos)
+        if len(self._controls) == 4:
+            self._resample(*self._controls, dabs)
+        if end_pos != self._last_pos:
+            dabs.append(end_pos)
+        self._paint(dabs)
+        self._controls = []
+
+        self._painter.end()
+        self._painter = None
+
+        rect = self.dirty_rect
+        if rect.isEmpty():
+            self._backup = {}
+            return None
+
+        after_patch = self.canvas_item.image().copy(rect)
+
+        # Untouched parts of the bounding rect are identical before and after.
+        before_patch = after_patch.copy()
+        painter = QPainter(before_patch)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for key, tile in self._backup.items():
+            tile_rect = self.canvas_item.tile_rect(*key)
+            painter.drawImage(tile_rect.topLeft() - rect.topLeft(), tile)
+        painter.end()
+        self._backup = {}
+
+        return rect, before_patch, after_patch
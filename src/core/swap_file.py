@@ -0,0 +1,124 @@
+"""
+Memory-mapped scratch file for spilled undo payloads.
+
+Each document owns one SwapFile. Blobs are written into a growing
+anonymous temporary file that is mapped into memory, so paging data back
+in is a plain slice of the mapping and the OS decides what stays resident.
+"""
+
+import mmap
+import tempfile
+import threading
+
+
+class SwapFile:
+    """Scratch file with a simple first-fit allocator over an mmap."""
+
+    def __init__(self, initial_size: int = 64 * 1024 * 1024, directory=None):
+        """
+        Initialize swap file.
+
+        Args:
+            initial_size: Size in bytes the file is first grown to
+            directory: Directory for the temporary file (default: system temp)
+        """
+        self._lock = threading.Lock()
+        self._file = tempfile.TemporaryFile(prefix="piu-undo-", dir=directory)
+        self._initial_size = initial_size
+        self._mmap = None
+        self._capacity = 0
+        self._end = 0
+        self._free = []  # Sorted list of (offset, length) holes below _end
+        self.used_bytes = 0
+
+    def _grow(self, required: int):
+        """Grow the file and remap it so at least `required` bytes fit."""
+        capacity = max(self._capacity, self._initial_size)
+        while capacity < required:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.truncate(capacity)
+        self._mmap = mmap.mmap(self._file.fileno(), capacity)
+        self._capacity = capacity
+
+    def _allocate(self, length: int) -> int:
+        """Find room for `length` bytes and return its offset."""
+        for index, (offset, hole) in enumerate(self._free):
+            if hole >= length:
+                if hole == length:
+                    del self._free[index]
+                else:
+                    self._free[index] = (offset + length, hole - length)
+                return offset
+
+        offset = self._end
+        self._grow(offset + length)
+        self._end = offset + length
+        return offset
+
+    def write(self, data) -> tuple:
+        """
+        Store a blob in the swap file.
+
+        Args:
+            data: bytes-like object to store
+
+        Returns:
+            tuple: (offset, length) handle for read() and release()
+        """
+        length = len(data)
+        with self._lock:
+            offset = self._allocate(length)
+            self._mmap[offset:offset + length] = data
+            self.used_bytes += length
+        return offset, length
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Read a blob back from the swap file.
+
+        Args:
+            offset: Offset returned by write()
+            length: Length returned by write()
+
+        Returns:
+            bytes: The stored data
+        """
+        with self._lock:
+            return self._mmap[offset:offset + length]
+
+    def release(self, offset: int, length: int):
+        """
+        Return a blob's space to the allocator.
+
+        Args:
+            offset: Offset returned by write()
+            length: Length returned by write()
+        """
+        with self._lock:
+            self.used_bytes -= length
+            self._free.append((offset, length))
+            self._free.sort()
+
+            merged = []
+            for hole in self._free:
+                if merged and merged[-1][0] + merged[-1][1] == hole[0]:
+                    merged[-1] = (merged[-1][0], merged[-1][1] + hole[1])
+                else:
+                    merged.append(hole)
+
+            if merged and merged[-1][0] + merged[-1][1] == self._end:
+                self._end = merged.pop()[0]
+            self._free = merged
+
+    def close(self):
+        """Unmap and delete the scratch file."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._file.close()
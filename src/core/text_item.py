@@ -0,0 +1,127 @@
+"""
+Editable text item for the text tool.
+
+Text lives in the QTextDocument of a QGraphicsTextItem. The document keeps
+one cached QTextLayout per paragraph and an edit only re-lays out the
+paragraphs it touched; glyphs are rasterized once per font and size by
+Qt's glyph cache. Painting only draws the paragraphs inside the exposed
+area, so a long text costs what is visible and what was edited.
+
+While the item is being edited it is drawn directly. Once editing ends it
+goes back to a device-coordinate cache: a cached pixmap of the whole item
+would otherwise be re-rendered on every keystroke.
+
+Edits are reported as one (position, removed, inserted) change per
+editing session, so undo replaces just that span instead of resetting
+the whole text.
+"""
+
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsTextItem
+from PyQt5.QtCore import Qt, QRectF, QEvent
+from PyQt5.QtGui import QTextCursor, QKeySequence
+
+
+def text_change(before, after):
+    """
+    Find the single span that differs between two texts.
+
+    Returns:
+        tuple or None: (position, removed, inserted), None if the texts are equal
+    """
+    if before == after:
+        return None
+    limit = min(len(before), len(after))
+    start = 0
+    while start < limit and before[start] == after[start]:
+        start += 1
+    end = 0
+    while end < limit - start and before[-1 - end] == after[-1 - end]:
+        end += 1
+    return start, before[start:len(before) - end], after[start:len(after) - end]
+
+
+class EditableTextItem(QGraphicsTextItem):
+    """Plain text item that can be edited in place and patched by commands."""
+
+    def __init__(self, text, font, color):
+        """
+        Initialize text item.
+
+        Args:
+            text: Initial plain text
+            font: QFont for the whole text
+            color: QColor of the text
+        """
+        super().__init__()
+        self.setFont(font)
+        self.setDefaultTextColor(color)
+        self.setPlainText(text)
+        # The command history owns undo; the document's own stack would
+        # only duplicate every edit in memory.
+        self.document().setUndoRedoEnabled(False)
+        # Pass the real exposed rectangle to paint() so only the visible
+        # paragraphs are drawn.
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self._text_before_edit = None
+        self._shown_rect = QRectF()  # Scene area the text covered at the last change
+        self.document().contentsChanged.connect(self._invalidate_composite)
+        self.document().documentLayout().documentSizeChanged.connect(self._invalidate_composite)
+
+    def _invalidate_composite(self):
+        """Drop composite tiles under the old and the new extent of the text."""
+        scene = self.scene()
+        rect = self.sceneBoundingRect()
+        if scene is not None and hasattr(scene, 'composite'):
+            scene.composite.invalidate_rects([self._shown_rect, rect])
+        self._shown_rect = rect
+
+    def sceneEvent(self, event):
+        # The text control claims Undo/Redo while editing, but its own undo
+        # is off; let them through to the application's Undo/Redo actions,
+        # which end the editing session first.
+        if (event.type() in (QEvent.ShortcutOverride, QEvent.KeyPress)
+                and (event.matches(QKeySequence.Undo) or event.matches(QKeySequence.Redo))):
+            event.ignore()
+            return False
+        return super().sceneEvent(event)
+
+    def is_editing(self):
+        """Check if the item is being edited."""
+        return self._text_before_edit is not None
+
+    def begin_edit(self):
+        """Make the item editable and give it keyboard focus."""
+        self._text_before_edit = self.toPlainText()
+        self.setCacheMode(QGraphicsItem.NoCache)
+        self.setTextInteractionFlags(Qt.TextEditorInteraction)
+        self.setFocus()
+
+    def end_edit(self):
+        """
+        Stop editing.
+
+        Returns:
+            tuple or None: (position, removed, inserted) made since begin_edit()
+        """
+        before = self._text_before_edit
+        self._text_before_edit = None
+        self.setTextInteractionFlags(Qt.NoTextInteraction)
+        self.clearFocus()
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        if before is None:
+            return None
+        return text_change(before, self.toPlainText())
+
+    def replace_text(self, position, length, text):
+        """
+        Replace a span of the text; only the paragraphs it touches are re-laid out.
+
+        Args:
+            position: Character offset of the span
+            length: Number of characters to replace
+            text: Replacement text
+        """
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(position)
+        cursor.setPosition(position + length, QTextCursor.KeepAnchor)
+        cursor.insertText(text)
@@ -0,0 +1,109 @@
+"""
+Tile-parallel filter execution.
+
+run_tiled() cuts an image into square tiles, grows each tile by a halo
+as wide as the filter's kernel radius, filters the tiles on a thread pool
+and copies every tile's interior into the result. Because the halo covers
+everything an interior pixel depends on, the stitched image is the same
+as filtering the whole image at once.
+
+Tiles are deep copies of QImage regions and results are stitched through
+pixel_buffer views, so pixel data stays in shared memory; the NumPy kernels
+release the GIL for their inner loops, which is where the time goes.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from PyQt5.QtCore import QRect, QThread
+from PyQt5.QtGui import QImage
+
+from src.core import pixel_buffer
+from src.core.filter_runner import checkpoint, current_job, helping
+
+
+TILE_SIZE = 1024
+MAX_WORKERS = 16
+
+
+def tile_rects(width, height, tile_size=TILE_SIZE):
+    """
+    Split an image area into a grid of tiles.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        tile_size: Edge length of a full tile
+
+    Returns:
+        list: QRect per tile, row by row
+    """
+    return [QRect(x, y, min(tile_size, width - x), min(tile_size, height - y))
+            for y in range(0, height, tile_size)
+            for x in range(0, width, tile_size)]
+
+
+def _pixels(image):
+    if image.format() == QImage.Format_Grayscale8:
+        return pixel_buffer.view_gray8(image)
+    return pixel_buffer.view(image)
+
+
+def run_tiled(image, filter_func, halo, tile_size=TILE_SIZE, max_workers=None):
+    """
+    Apply a filter tile by tile across worker threads.
+
+    Falls back to a single filter_func(image) call when the filter cannot
+    be tiled, only one worker is available or the image fits in one tile.
+
+    Args:
+        image: QImage to filter (may be modified in place)
+        filter_func: Function that takes QImage and returns filtered QImage;
+            it is called for several tiles at once, so it must be bound to
+            settings read beforehand (see BaseFilter.snapshot()), not
+            touch any widgets and not mutate shared state such as the
+            tables of a PointOperation
+        halo: Kernel radius of the filter for those same settings, or None
+            if it cannot be tiled
+        tile_size: Edge length of a tile without its halo
+        max_workers: Thread limit (defaults to the core count, capped at MAX_WORKERS)
+
+    Returns:
+        QImage: Filtered image
+    """
+    workers = max_workers or min(QThread.idealThreadCount(), MAX_WORKERS)
+    # Keep the halo a small fraction of each tile.
+    tile_size = max(tile_size, 4 * (halo or 0))
+    rects = tile_rects(image.width(), image.height(), tile_size)
+    if halo is None or workers <= 1 or len(rects) <= 1:
+        return filter_func(image)
+
+    bounds = image.rect()
+    job = current_job()
+
+    def run_tile(rect):
+        with helping(job):
+            checkpoint()
+            outer = rect.adjusted(-halo, -halo, halo, halo).intersected(bounds)
+            result = filter_func(image.copy(outer))
+            return rect, rect.translated(-outer.topLeft()), result
+
+    result = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="filter-tile") as pool:
+        pending = {pool.submit(run_tile, rect) for rect in rects}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rect, inner, tile = future.result()
+                    if result is None:
+                        result = QImage(image.size(), tile.format())
+                    elif tile.format() != result.format():
+                        tile = tile.convertToFormat(result.format())
+                    _pixels(result)[rect.top():rect.bottom() + 1, rect.left():rect.right() + 1] = \
+                        _pixels(tile)[inner.top():inner.bottom() + 1, inner.left():inner.right() + 1]
+                checkpoint(1.0 - len(pending) / len(rects))
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return result
@@ -0,0 +1,111 @@
+"""
+Tiled raster surface for the canvas.
+
+TiledCanvasItem keeps the canvas pixels in one QImage but draws it as a
+grid of small cached pixmaps. Tools, commands and filters paint into the
+image and call mark_dirty() with the rectangle they touched, so only the
+affected tiles are re-converted and only that part of the view repaints.
+"""
+
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import QRect, QRectF
+from PyQt5.QtGui import QImage, QPixmap, QPainter
+
+
+class TiledCanvasItem(QGraphicsItem):
+    """Graphics item that renders a QImage through per-tile pixmaps."""
+
+    TILE_SIZE = 256
+
+    def __init__(self, image: QImage, tile_size: int = TILE_SIZE):
+        """
+        Initialize tiled canvas item.
+
+        Args:
+            image: Initial pixels (converted to ARGB32 premultiplied)
+            tile_size: Edge length of a tile in pixels
+        """
+        super().__init__()
+        self._tile_size = tile_size
+        self._image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self._tiles = {}  # (column, row) -> QPixmap
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self._image.width(), self._image.height())
+
+    def image(self) -> QImage:
+        """
+        Get the live backing image.
+
+        Paint into it and call mark_dirty() with the touched rectangle.
+        Use QImage(item.image()) for a cheap copy-on-write snapshot.
+        """
+        return self._image
+
+    def set_image(self, image: QImage):
+        """
+        Replace the whole surface.
+
+        Args:
+            image: New pixels (converted to ARGB32 premultiplied)
+        """
+        if image.size() != self._image.size():
+            self.prepareGeometryChange()
+        self._image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self._tiles.clear()
+        self.update()
+        self._invalidate_composite(self.boundingRect())
+
+    def mark_dirty(self, rect: QRect):
+        """
+        Invalidate the tiles overlapping a rectangle and schedule a repaint.
+
+        Args:
+            rect: Region of the image that changed
+        """
+        rect = rect.intersected(self._image.rect())
+        if rect.isEmpty():
+            return
+        for key in self.tiles_in(rect):
+            self._tiles.pop(key, None)
+        self.update(QRectF(rect))
+        self._invalidate_composite(QRectF(rect))
+
+    def _invalidate_composite(self, rect: QRectF):
+        """Tell the scene's composite cache, if it has one, that pixels changed."""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'composite'):
+            scene.composite.invalidate_rects([self.mapRectToScene(rect)])
+
+    def tiles_in(self, rect: QRect):
+        """Yield (column, row) keys of tiles overlapping a rectangle."""
+        size = self._tile_size
+        for row in range(rect.top() // size, rect.bottom() // size + 1):
+            for column in range(rect.left() // size, rect.right() // size + 1):
+                yield column, row
+
+    def tile_rect(self, column, row) -> QRect:
+        """Get the image rectangle covered by a tile."""
+        size = self._tile_size
+        return QRect(column * size, row * size, size, size).intersected(self._image.rect())
+
+    def _tile(self, column, row) -> QPixmap:
+        """Get a tile pixmap, converting it from the image if it is stale."""
+        pixmap = self._tiles.get((column, row))
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(self._image.copy(self.tile_rect(column, row)))
+            self._tiles[(column, row)] = pixmap
+        return pixmap
+
+    def paint(self, painter, option, widget=None):
+        exposed = option.exposedRect.toAlignedRect().intersected(self._image.rect())
+        if exposed.isEmpty():
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        size = self._tile_size
+        for column, row in self.tiles_in(exposed):
+            painter.drawPixmap(column * size, row * size, self._tile(column, row))
+        painter.restore()
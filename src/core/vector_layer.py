@@ -0,0 +1,129 @@
+"""
+Live shape/text items of a document scene.
+
+Queries go through the scene's BSP tree index, so hit-testing and
+rubber-band selection cost depends on the items near the query, not on
+how many items the document holds. Items are given a device-coordinate
+cache when they join the layer: a repaint blits their cached pixmaps
+instead of re-running their paint code, and only items in the exposed
+area are touched at all.
+
+Selected items are outlined by one path item. Dragging a selection only
+moves that outline; the items themselves move once, on release.
+
+The document may still bake items into its flattened layer when repaints
+get slow. Baked items are out of the scene and its index, so hit-testing
+also checks them and, on a hit, has the document put them back first.
+"""
+
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsPathItem
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainterPath, QPen
+
+from src.core.item_registry import ItemRole
+
+
+class VectorLayer:
+    """Index-backed access to a scene's shape/text items and their selection."""
+
+    def __init__(self, scene):
+        """
+        Initialize vector layer.
+
+        Args:
+            scene: DocumentScene holding the items
+        """
+        self.scene = scene
+        self.selected = []  # Selected items, bottom to top
+        self._flattened_items = list  # Returns the items baked out of the scene
+        self._unflatten = None
+
+    def set_flattened_source(self, flattened_items, unflatten):
+        """
+        Let hit-testing see items baked into a flattened layer.
+
+        Args:
+            flattened_items: Function returning the baked items
+            unflatten: Function that puts every baked item back into the scene
+        """
+        self._flattened_items = flattened_items
+        self._unflatten = unflatten
+
+    def _restore_flattened(self, hit):
+        """Unflatten if a query would hit a baked item, so the index can find it."""
+        if self._unflatten is not None and any(hit(item) for item in self._flattened_items()):
+            self._unflatten()
+
+    @staticmethod
+    def is_vector(item):
+        """Check if an item is a top-level shape/text item rather than a document layer."""
+        return item.parentItem() is None and item.data(0) is None
+
+    def add(self, item):
+        """Add a shape/text item to the scene with device-coordinate caching."""
+        item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.scene.addItem(item)
+        self.scene.composite.invalidate_rects([item.sceneBoundingRect()])
+
+    def remove(self, item):
+        """Take an item out of the scene and the selection."""
+        if item in self.selected:
+            self.select([i for i in self.selected if i is not item])
+        if item.scene() is self.scene:
+            self.scene.removeItem(item)
+            self.scene.composite.invalidate_rects([item.sceneBoundingRect()])
+
+    def items(self):
+        """Get every live shape/text item, bottom to top."""
+        return [item for item in self.scene.items(Qt.AscendingOrder) if self.is_vector(item)]
+
+    def items_in(self, rect: QRectF, mode=Qt.IntersectsItemShape):
+        """Get the shape/text items touching a scene rectangle, bottom to top."""
+        self._restore_flattened(lambda item: item.sceneBoundingRect().intersects(rect))
+        return [item for item in self.scene.items(rect, mode, Qt.AscendingOrder)
+                if self.is_vector(item) and item.isVisible()]
+
+    def item_at(self, pos: QPointF):
+        """Get the topmost shape/text item under a scene point, or None."""
+        self._restore_flattened(lambda item: item.sceneBoundingRect().contains(pos))
+        for item in self.scene.items(pos, Qt.IntersectsItemShape, Qt.DescendingOrder):
+            if self.is_vector(item) and item.isVisible():
+                return item
+        return None
+
+    def select(self, items):
+        """
+        Replace the selection and redraw its outline.
+
+        Args:
+            items: Shape/text items to select, bottom to top
+        """
+        self.selected = [item for item in items if item.scene() is self.scene]
+        outline = self.scene.registry.get(ItemRole.OBJECT_SELECTION)
+        if not self.selected:
+            if outline is not None:
+                self.scene.registry.unregister(ItemRole.OBJECT_SELECTION)
+                self.scene.removeItem(outline)
+            return
+
+        if outline is None:
+            outline = QGraphicsPathItem()
+            outline.setPen(QPen(Qt.blue, 0, Qt.DashLine))  # Cosmetic: one screen pixel at any zoom
+            outline.setZValue(1e6)
+            self.scene.registry.register(ItemRole.OBJECT_SELECTION, outline)
+            self.scene.addItem(outline)
+        path = QPainterPath()
+        for item in self.selected:
+            path.addRect(item.sceneBoundingRect())
+        outline.setPath(path)
+        outline.setPos(0, 0)
+
+    def show_drag_offset(self, offset: QPointF):
+        """Move only the selection outline, e.g. while the selection is dragged."""
+        outline = self.scene.registry.get(ItemRole.OBJECT_SELECTION)
+        if outline is not None:
+            outline.setPos(offset)
+
+    def reset(self):
+        """Forget the selection, e.g. after the scene has been cleared."""
+        self.selected = []
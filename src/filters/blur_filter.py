@@ -1,7 +1,9 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSlider,
                              QPushButton, QComboBox, QAction)
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core import convolution, pixel_buffer
 
 
 class BlurFilter(BaseFilter):
@@ -27,15 +29,32 @@ class BlurFilter(BaseFilter):
         self.radius_slider.setValue(5)
         self.radius_slider.valueChanged.connect(lambda val: radius_label.setText(f"Radius: {val}"))
 
-        apply_btn = QPushButton("Apply Filter")
+        angle_label = QLabel("Angle: 0°")
+        self.angle_slider = QSlider(Qt.Horizontal)
+        self.angle_slider.setRange(0, 179)
+        self.angle_slider.setValue(0)
+        self.angle_slider.valueChanged.connect(lambda val: angle_label.setText(f"Angle: {val}°"))
+
+        def update_angle_visibility(blur_type):
+            is_motion = blur_type == "Motion Blur"
+            angle_label.setVisible(is_motion)
+            self.angle_slider.setVisible(is_motion)
+
+        self.blur_type_combo.currentTextChanged.connect(update_angle_visibility)
+        update_angle_visibility(self.blur_type_combo.currentText())
+
+        self.apply_btn = QPushButton("Apply Filter")
         reset_btn = QPushButton("Reset")
         reset_btn.clicked.connect(lambda: self.radius_slider.setValue(5))
+        reset_btn.clicked.connect(lambda: self.angle_slider.setValue(0))
 
         layout.addWidget(blur_type_label)
         layout.addWidget(self.blur_type_combo)
         layout.addWidget(radius_label)
         layout.addWidget(self.radius_slider)
-        layout.addWidget(apply_btn)
+        layout.addWidget(angle_label)
+        layout.addWidget(self.angle_slider)
+        layout.addWidget(self.apply_btn)
         layout.addWidget(reset_btn)
         layout.addStretch()
 
@@ -45,5 +64,45 @@ class BlurFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "blur"
 
-    def apply_filter(self, image):
-        pass
+    def get_kernel_radius(self):
+        radius = self.radius_slider.value()
+        if self.blur_type_combo.currentText() == "Gaussian Blur":
+            return convolution.gaussian_support(convolution.radius_to_sigma(radius))
+        return radius
+
+    def apply_filter(self, image: QImage) -> QImage:
+        """
+        Blur the image in place.
+
+        Pixels are blurred in premultiplied form so transparent pixels do
+        not bleed their (meaningless) color into visible neighbours.
+        """
+        return self.make_filter_func()(image)
+
+    def apply_preview(self, image: QImage, scale: float) -> QImage:
+        return self._make_blur(scale)(image)
+
+    def make_filter_func(self):
+        return self._make_blur(1.0)
+
+    def _make_blur(self, scale):
+        blur_type = self.blur_type_combo.currentText()
+        radius = self.radius_slider.value() * scale
+        angle = self.angle_slider.value()
+        return lambda image: self._blur(image, blur_type, radius, angle)
+
+    @staticmethod
+    def _blur(image: QImage, blur_type: str, radius: float, angle: int) -> QImage:
+        if image.format() != QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        pixels = pixel_buffer.view(image)
+
+        if blur_type == "Box Blur":
+            convolution.box_blur(pixels, int(round(radius)))
+        elif blur_type == "Motion Blur":
+            convolution.motion_blur(pixels, int(round(radius)), angle)
+        else:
+            convolution.gaussian_blur(pixels, convolution.radius_to_sigma(radius))
+
+        return image
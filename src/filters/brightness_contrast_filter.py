@@ -1,7 +1,29 @@
+import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSlider,
                              QPushButton, QAction)
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core import pixel_buffer, point_ops
+
+
+def brightness_contrast_lut(brightness, contrast):
+    """
+    Build the lookup table for a brightness/contrast adjustment.
+
+    Args:
+        brightness: -100..100, shifts every value by up to a full range
+        contrast: -100..100, scales values around mid-gray
+
+    Returns:
+        np.ndarray: 256-entry uint8 table
+    """
+    values = np.arange(256, dtype=np.float32)
+    values += brightness * 255 / 100
+    c = contrast * 255 / 100
+    factor = 259 * (c + 255) / (255 * (259 - c))
+    values = (values - 128) * factor + 128
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
 
 
 class BrightnessContrastFilter(BaseFilter):
@@ -33,7 +55,7 @@ class BrightnessContrastFilter(BaseFilter):
             lambda val: self.contrast_label.setText(f"Contrast: {val}")
         )
 
-        apply_btn = QPushButton("Apply Filter")
+        self.apply_btn = QPushButton("Apply Filter")
         reset_btn = QPushButton("Reset")
         reset_btn.clicked.connect(
             lambda: (self.brightness_slider.setValue(0), self.contrast_slider.setValue(0))
@@ -45,7 +67,7 @@ class BrightnessContrastFilter(BaseFilter):
         layout.addWidget(QLabel("Contrast:"))
         layout.addWidget(self.contrast_label)
         layout.addWidget(self.contrast_slider)
-        layout.addWidget(apply_btn)
+        layout.addWidget(self.apply_btn)
         layout.addWidget(reset_btn)
         layout.addStretch()
 
@@ -55,5 +77,20 @@ class BrightnessContrastFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "brightness_contrast"
 
-    def apply_filter(self, image):
-        pass
+    def get_point_operation(self):
+        lut = brightness_contrast_lut(self.brightness_slider.value(), self.contrast_slider.value())
+        return point_ops.PointOperation.from_luts(red=lut, green=lut, blue=lut)
+
+    def apply_filter(self, image: QImage) -> QImage:
+        """Map the color channels through a brightness/contrast table, keeping alpha."""
+        return self.make_filter_func()(image)
+
+    def make_filter_func(self):
+        operation = self.get_point_operation()
+
+        def apply(image):
+            image = image.convertToFormat(QImage.Format_ARGB32)
+            operation.apply(pixel_buffer.view(image))
+            return image
+
+        return apply
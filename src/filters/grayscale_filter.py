@@ -1,8 +1,18 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QAction)
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QAction,
+                             QComboBox, QCheckBox)
+from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core import pixel_buffer, point_ops
 
 
 class GrayscaleFilter(BaseFilter):
+    MODES = [
+        ("Luminance (Rec. 601)", 'rec601'),
+        ("Luminance (Rec. 709)", 'rec709'),
+        ("Average", 'average'),
+        ("Desaturate", 'desaturate'),
+    ]
+
     def __init__(self):
         super().__init__("Grayscale", None)
 
@@ -15,13 +25,24 @@ class GrayscaleFilter(BaseFilter):
         filter_widget = QWidget()
         layout = QVBoxLayout(filter_widget)
 
-        info_label = QLabel("Converts the image to grayscale.\nNo additional settings required.")
+        info_label = QLabel("Converts the image to grayscale.")
         info_label.setWordWrap(True)
 
-        apply_btn = QPushButton("Apply Filter")
+        mode_label = QLabel("Mode:")
+        self.mode_combo = QComboBox()
+        for label, mode in self.MODES:
+            self.mode_combo.addItem(label, mode)
+
+        self.gray8_checkbox = QCheckBox("8-bit result (drops transparency)")
+        self.gray8_checkbox.setToolTip("Store the result as 8-bit grayscale, using a quarter of the memory")
+
+        self.apply_btn = QPushButton("Apply Filter")
 
         layout.addWidget(info_label)
-        layout.addWidget(apply_btn)
+        layout.addWidget(mode_label)
+        layout.addWidget(self.mode_combo)
+        layout.addWidget(self.gray8_checkbox)
+        layout.addWidget(self.apply_btn)
         layout.addStretch()
 
         self._settings_widget = filter_widget
@@ -30,5 +51,23 @@ class GrayscaleFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "grayscale"
 
-    def apply_filter(self, image):
-        pass
+    def get_point_operation(self):
+        return point_ops.PointOperation.from_grayscale(self.mode_combo.currentData())
+
+    def apply_filter(self, image: QImage) -> QImage:
+        """Convert the image to grayscale in place, or to an 8-bit image."""
+        return self.make_filter_func()(image)
+
+    def make_filter_func(self):
+        mode = self.mode_combo.currentData()
+        gray8 = self.gray8_checkbox.isChecked()
+
+        def apply(image):
+            if image.format() not in pixel_buffer.SUPPORTED_FORMATS:
+                image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            if gray8:
+                return point_ops.to_grayscale8(image, mode)
+            point_ops.grayscale(pixel_buffer.view(image), mode)
+            return image
+
+        return apply
@@ -1,7 +1,52 @@
+import math
+
+import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSlider,
                              QPushButton, QAction)
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core import pixel_buffer, point_ops
+
+
+# Luma weights of the gray axis that hue rotation and saturation pivot around.
+LUMA = np.array([0.213, 0.715, 0.072])
+
+
+def hue_saturation_transform(hue, saturation, lightness):
+    """
+    Express a hue/saturation/lightness adjustment as one affine color transform.
+
+    Hue rotates colors around the gray axis and saturation scales their
+    distance from it, both linear in RGB, so they are applied with a 3x3
+    matrix instead of a per-pixel RGB->HSL->RGB round trip. Lightness
+    blends toward white or black and folds into the same matrix and offset.
+
+    Args:
+        hue: Rotation in degrees, -180..180
+        saturation: -100..100, where -100 is fully desaturated
+        lightness: -100..100, where 100 is white and -100 is black
+
+    Returns:
+        tuple: (3x3 matrix, 3-element offset) for point_ops.apply_color_matrix
+    """
+    cos_h = math.cos(math.radians(hue))
+    sin_h = math.sin(math.radians(hue))
+    gray = np.tile(LUMA, (3, 1))
+    rotation = (gray
+                + cos_h * (np.eye(3) - gray)
+                + sin_h * np.array([[-0.213, -0.715, 0.928],
+                                    [0.143, 0.140, -0.283],
+                                    [-0.787, 0.715, 0.072]]))
+
+    factor = 1 + saturation / 100
+    saturate = gray + factor * (np.eye(3) - gray)
+
+    matrix = saturate @ rotation
+    amount = lightness / 100
+    if amount >= 0:
+        return matrix * (1 - amount), np.full(3, 255 * amount)
+    return matrix * (1 + amount), np.zeros(3)
 
 
 class HueSaturationFilter(BaseFilter):
@@ -35,7 +80,7 @@ class HueSaturationFilter(BaseFilter):
         self.lightness_slider.setValue(0)
         self.lightness_slider.valueChanged.connect(lambda val: lightness_label.setText(f"Lightness: {val}"))
 
-        apply_btn = QPushButton("Apply Filter")
+        self.apply_btn = QPushButton("Apply Filter")
         reset_btn = QPushButton("Reset")
         reset_btn.clicked.connect(
             lambda: (self.hue_slider.setValue(0), self.saturation_slider.setValue(0), self.lightness_slider.setValue(0))
@@ -47,7 +92,7 @@ class HueSaturationFilter(BaseFilter):
         layout.addWidget(self.saturation_slider)
         layout.addWidget(lightness_label)
         layout.addWidget(self.lightness_slider)
-        layout.addWidget(apply_btn)
+        layout.addWidget(self.apply_btn)
         layout.addWidget(reset_btn)
         layout.addStretch()
 
@@ -57,5 +102,21 @@ class HueSaturationFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "hue_saturation"
 
-    def apply_filter(self, image):
-        pass
+    def get_point_operation(self):
+        matrix, offset = hue_saturation_transform(
+            self.hue_slider.value(), self.saturation_slider.value(), self.lightness_slider.value())
+        return point_ops.PointOperation.from_color_matrix(matrix, offset)
+
+    def apply_filter(self, image: QImage) -> QImage:
+        """Adjust hue, saturation and lightness, keeping alpha."""
+        return self.make_filter_func()(image)
+
+    def make_filter_func(self):
+        operation = self.get_point_operation()
+
+        def apply(image):
+            image = image.convertToFormat(QImage.Format_ARGB32)
+            operation.apply(pixel_buffer.view(image))
+            return image
+
+        return apply
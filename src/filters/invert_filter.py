@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QAction)
 from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core.point_ops import PointOperation, IDENTITY
 
 
 class InvertFilter(BaseFilter):
@@ -31,6 +32,10 @@ class InvertFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "invert"
 
+    def get_point_operation(self):
+        lut = IDENTITY[::-1]
+        return PointOperation.from_luts(red=lut, green=lut, blue=lut)
+
     def apply_filter(self, image: QImage) -> QImage:
         """Apply invert filter to the image, preserving transparency."""
         result = image.copy()
@@ -1,7 +1,9 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSlider,
                              QPushButton, QAction)
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
 from src.core.base_filter import BaseFilter
+from src.core import convolution, pixel_buffer
 
 
 class SharpenFilter(BaseFilter):
@@ -19,17 +21,36 @@ class SharpenFilter(BaseFilter):
 
         amount_label = QLabel("Amount: 50%")
         self.amount_slider = QSlider(Qt.Horizontal)
-        self.amount_slider.setRange(0, 100)
+        self.amount_slider.setRange(0, 300)
         self.amount_slider.setValue(50)
         self.amount_slider.valueChanged.connect(lambda val: amount_label.setText(f"Amount: {val}%"))
 
-        apply_btn = QPushButton("Apply Filter")
+        radius_label = QLabel("Radius: 2")
+        self.radius_slider = QSlider(Qt.Horizontal)
+        self.radius_slider.setRange(1, 20)
+        self.radius_slider.setValue(2)
+        self.radius_slider.valueChanged.connect(lambda val: radius_label.setText(f"Radius: {val}"))
+
+        threshold_label = QLabel("Threshold: 0")
+        self.threshold_slider = QSlider(Qt.Horizontal)
+        self.threshold_slider.setRange(0, 255)
+        self.threshold_slider.setValue(0)
+        self.threshold_slider.valueChanged.connect(lambda val: threshold_label.setText(f"Threshold: {val}"))
+
+        self.apply_btn = QPushButton("Apply Filter")
         reset_btn = QPushButton("Reset")
-        reset_btn.clicked.connect(lambda: self.amount_slider.setValue(50))
+        reset_btn.clicked.connect(
+            lambda: (self.amount_slider.setValue(50), self.radius_slider.setValue(2),
+                     self.threshold_slider.setValue(0))
+        )
 
         layout.addWidget(amount_label)
         layout.addWidget(self.amount_slider)
-        layout.addWidget(apply_btn)
+        layout.addWidget(radius_label)
+        layout.addWidget(self.radius_slider)
+        layout.addWidget(threshold_label)
+        layout.addWidget(self.threshold_slider)
+        layout.addWidget(self.apply_btn)
         layout.addWidget(reset_btn)
         layout.addStretch()
 
@@ -39,5 +60,34 @@ class SharpenFilter(BaseFilter):
     def get_filter_name(self) -> str:
         return "sharpen"
 
-    def apply_filter(self, image):
-        pass
+    def get_kernel_radius(self):
+        return convolution.gaussian_support(convolution.radius_to_sigma(self.radius_slider.value()))
+
+    def apply_filter(self, image: QImage) -> QImage:
+        """Sharpen the image in place with an unsharp mask."""
+        return self.make_filter_func()(image)
+
+    def apply_preview(self, image: QImage, scale: float) -> QImage:
+        return self._make_sharpen(scale)(image)
+
+    def make_filter_func(self):
+        return self._make_sharpen(1.0)
+
+    def _make_sharpen(self, scale):
+        radius = self.radius_slider.value() * scale
+        amount = self.amount_slider.value() / 100
+        threshold = self.threshold_slider.value()
+        return lambda image: self._sharpen(image, radius, amount, threshold)
+
+    @staticmethod
+    def _sharpen(image: QImage, radius: float, amount: float, threshold: int) -> QImage:
+        if image.format() != QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        convolution.unsharp_mask(
+            pixel_buffer.view(image),
+            sigma=convolution.radius_to_sigma(radius),
+            amount=amount,
+            threshold=threshold,
+        )
+        return image
@@ -79,7 +79,10 @@ class BrushTool(BaseTool):
         return True
 
     def mouse_press_event(self, event, scene, view=None):
-        """Start a new stroke - capture initial canvas state."""
+        """Start a new stroke on the canvas."""
+        from PyQt5.QtGui import QPen
+        from src.core.stroke_engine import StrokeEngine
+        from src.core.item_registry import ItemRole
         
         if view:
             pos = view.mapToScene(event.pos())
@@ -88,15 +91,23 @@ class BrushTool(BaseTool):
         
         self.view = view
         
-        self.last_pos = pos
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if not canvas_item:
+            return
         
-        self.before_image = None
+        pen = QPen(self.current_color if hasattr(self, 'current_color') else Qt.black)
+        pen.setWidth(self.size_spin.value())
+        pen.setCapStyle(Qt.RoundCap)
+        pen.setJoinStyle(Qt.RoundJoin)
+        
+        self.stroke = StrokeEngine()
+        self.stroke.begin(canvas_item, pos, pen, self.opacity_slider.value() / 100.0)
         
         print(f"[{self.tool_type.capitalize()}] Started stroke at ({pos.x():.1f}, {pos.y():.1f})")
 
     def mouse_move_event(self, event, scene, view=None):
-        """Continue the stroke - draw directly to canvas pixels."""
-        if not hasattr(self, 'last_pos') or self.last_pos is None:
+        """Continue the stroke - paint the new segment into the canvas."""
+        if not hasattr(self, 'stroke') or not self.stroke.is_active():
             return
             
         if view:
@@ -104,42 +115,19 @@ class BrushTool(BaseTool):
         else:
             current_pos = event.pos()
         
-        from PyQt5.QtGui import QPainter, QPen, QPixmap
-        
-        canvas_item = None
-        for item in scene.items():
-            if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                canvas_item = item
-                break
-        
-        if not canvas_item:
+        self.stroke.add_points([current_pos])
+
+    def mouse_move_batch_event(self, events, scene, view=None):
+        """Continue the stroke through every coalesced move event at once."""
+        if not hasattr(self, 'stroke') or not self.stroke.is_active():
             return
         
-        if self.before_image is None:
-            self.before_image = canvas_item.pixmap().toImage().copy()
-        
-        pixmap = canvas_item.pixmap()
-        painter = QPainter(pixmap)
-        
-        size = self.size_spin.value()
-        opacity = self.opacity_slider.value() / 100.0
-        
-        pen = QPen(self.current_color if hasattr(self, 'current_color') else Qt.black)
-        pen.setWidth(size)
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setJoinStyle(Qt.RoundJoin)
-        
-        painter.setPen(pen)
-        painter.setOpacity(opacity)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        painter.drawLine(self.last_pos, current_pos)
-        
-        painter.end()
-        
-        canvas_item.setPixmap(pixmap)
+        if view:
+            points = [view.mapToScene(event.pos()) for event in events]
+        else:
+            points = [event.pos() for event in events]
         
-        self.last_pos = current_pos
+        self.stroke.add_points(points)
 
     def mouse_release_event(self, event, scene, view=None):
         """Finish the stroke and create a command."""
@@ -152,29 +140,17 @@ class BrushTool(BaseTool):
         
         print(f"[{self.tool_type.capitalize()}] Finished stroke at ({pos.x():.1f}, {pos.y():.1f})")
         
-        if hasattr(self, 'before_image') and self.before_image is not None:
-            canvas_item = None
-            for item in scene.items():
-                if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                    canvas_item = item
-                    break
-            
-            if canvas_item:
-                after_image = canvas_item.pixmap().toImage().copy()
-                
-                command = PixelDrawCommand(
-                    self.before_image,
-                    after_image,
-                    f"{self.tool_type.capitalize()} Stroke"
-                )
-                
-                self.before_image = None
-                self.last_pos = None
-                
-                return command
-        
-        self.before_image = None
-        self.last_pos = None
+        if not hasattr(self, 'stroke'):
+            return None
         
-        return None
-
+        result = self.stroke.end()
+        if result is None:
+            return None
+        
+        rect, before_patch, after_patch = result
+        return PixelDrawCommand(
+            rect,
+            before_patch,
+            after_patch,
+            f"{self.tool_type.capitalize()} Stroke"
+        )
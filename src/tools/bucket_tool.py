@@ -1,7 +1,10 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSlider,
-                             QPushButton, QGroupBox, QAction)
-from PyQt5.QtCore import Qt
+                             QPushButton, QGroupBox, QAction, QCheckBox)
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QColor
 from src.core.base_tool import BaseTool
+from src.core.item_registry import ItemRole
+from src.core import flood_fill, pixel_buffer
 
 
 class BucketTool(BaseTool):
@@ -9,6 +12,7 @@ class BucketTool(BaseTool):
         super().__init__("Paint Bucket", None)
         self.color_callback = color_callback
         self.current_color = current_color
+        self.pending_command = None
 
     def create_action(self) -> QAction:
         self._action = QAction(self.name)
@@ -25,8 +29,13 @@ class BucketTool(BaseTool):
         self.tolerance_slider.setValue(30)
         self.tolerance_slider.valueChanged.connect(lambda val: tolerance_label.setText(f"Tolerance: {val}"))
 
+        self.contiguous_checkbox = QCheckBox("Contiguous")
+        self.contiguous_checkbox.setToolTip("Fill only the connected area around the click")
+        self.contiguous_checkbox.setChecked(True)
+
         layout.addWidget(tolerance_label)
         layout.addWidget(self.tolerance_slider)
+        layout.addWidget(self.contiguous_checkbox)
         layout.addStretch()
 
         self._settings_widget = bucket_widget
@@ -38,13 +47,76 @@ class BucketTool(BaseTool):
     def needs_color(self) -> bool:
         return True
 
+    def _fill_value(self):
+        """Get the fill color as a premultiplied canvas pixel."""
+        pixel = QImage(1, 1, QImage.Format_ARGB32_Premultiplied)
+        pixel.fill(QColor(self.current_color) if self.current_color is not None else QColor(Qt.black))
+        return pixel_buffer.view(pixel, writable=False)[0, 0].copy()
+
+    def _rect(self, bounds):
+        left, top, right, bottom = bounds
+        return QRect(left, top, right - left, bottom - top)
+
     def mouse_press_event(self, event, scene, view=None):
-        pos = event.pos()
+        """Fill the area under the click and prepare its undo command."""
+        from src.commands.filter_command import FilterCommand
+        from src.commands.pixel_draw_command import PixelDrawCommand
+
+        self.pending_command = None
+        pos = view.mapToScene(event.pos()) if view else event.pos()
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if not canvas_item:
+            return
+
+        canvas_image = canvas_item.image()
+        x, y = int(pos.x()), int(pos.y())
+        if not canvas_image.rect().contains(x, y):
+            return
+
         tolerance = self.tolerance_slider.value()
-        print(f"[Paint Bucket] Clicked at ({pos.x()}, {pos.y()}) - Tolerance: {tolerance}")
+        contiguous = self.contiguous_checkbox.isChecked()
+        distance = flood_fill.tolerance_to_distance(tolerance)
+        value = self._fill_value()
+
+        # Colors are matched against what is visible, including an opened
+        # image under the canvas; the fill itself goes into the canvas.
+        background_item = scene.registry.get(ItemRole.BACKGROUND)
+        if background_item is not None:
+            sample_image = FilterCommand.merge_source(canvas_image, background_item.image())
+        else:
+            sample_image = canvas_image
+        sample = pixel_buffer.view(sample_image, writable=False)
+
+        if contiguous:
+            runs = flood_fill.contiguous_runs(sample, x, y, distance)
+            bounds = flood_fill.runs_bounds(runs)
+            before_patch = canvas_image.copy(self._rect(bounds))
+            flood_fill.paint_runs(pixel_buffer.view(canvas_image), runs, value)
+        else:
+            # The extent is only known after filling, so keep the old pixels
+            # alive; the fill's first write detaches the canvas from them.
+            before_image = QImage(canvas_image)
+            if sample_image is canvas_image:
+                sample_image = before_image
+                sample = pixel_buffer.view(before_image, writable=False)
+            bounds = flood_fill.global_fill(pixel_buffer.view(canvas_image), sample,
+                                            sample[y, x].copy(), distance, value)
+            if bounds is None:
+                return
+            before_patch = before_image.copy(self._rect(bounds))
+
+        rect = self._rect(bounds)
+        canvas_item.mark_dirty(rect)
+        self.pending_command = PixelDrawCommand(rect, before_patch, canvas_image.copy(rect),
+                                                "Paint Bucket Fill")
+        print(f"[Paint Bucket] Filled {rect.width()}x{rect.height()} area at ({x}, {y}) - "
+              f"Tolerance: {tolerance}, {'contiguous' if contiguous else 'global'}")
 
     def mouse_move_event(self, event, scene, view=None):
         pass
 
     def mouse_release_event(self, event, scene, view=None):
-        pass
+        """Hand the fill's command to the view so it lands in the history."""
+        command = self.pending_command
+        self.pending_command = None
+        return command
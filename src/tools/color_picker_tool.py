@@ -1,10 +1,21 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QAction)
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QComboBox, QAction)
 from src.core.base_tool import BaseTool
 
 
 class ColorPickerTool(BaseTool):
-    def __init__(self):
+    SAMPLE_SIZES = [("Point Sample", 1), ("3 x 3 Average", 3), ("5 x 5 Average", 5), ("11 x 11 Average", 11)]
+
+    def __init__(self, color_callback=None):
+        """
+        Initialize eyedropper.
+
+        Args:
+            color_callback: Called with (QColor, final) for every sample;
+                final is True for the sample taken when the mouse is released
+        """
         super().__init__("Eyedropper", None)
+        self.color_callback = color_callback
+        self.picking = False
 
     def create_action(self) -> QAction:
         self._action = QAction(self.name)
@@ -15,10 +26,16 @@ class ColorPickerTool(BaseTool):
         picker_widget = QWidget()
         layout = QVBoxLayout(picker_widget)
 
-        info_label = QLabel("Click on the image to pick a color.\nThe selected color will be set as the current color.")
+        info_label = QLabel("Click or drag on the image to pick a color.\nThe selected color will be set as the current color.")
         info_label.setWordWrap(True)
 
+        self.sample_size_combo = QComboBox()
+        for label, size in self.SAMPLE_SIZES:
+            self.sample_size_combo.addItem(label, size)
+
         layout.addWidget(info_label)
+        layout.addWidget(QLabel("Sample Size:"))
+        layout.addWidget(self.sample_size_combo)
         layout.addStretch()
 
         self._settings_widget = picker_widget
@@ -27,12 +44,26 @@ class ColorPickerTool(BaseTool):
     def get_tool_name(self) -> str:
         return "color_picker"
 
+    def _pick(self, event, scene, view, final):
+        """Sample the cached composite under the cursor and report the color."""
+        pos = view.mapToScene(event.pos()) if view else event.pos()
+        color = scene.composite.sample(int(pos.x()), int(pos.y()), self.sample_size_combo.currentData())
+        if color is not None and self.color_callback:
+            self.color_callback(color, final)
+        return color
+
     def mouse_press_event(self, event, scene, view=None):
-        pos = event.pos()
-        print(f"[Eyedropper] Picking color at ({pos.x()}, {pos.y()})")
+        self.picking = True
+        color = self._pick(event, scene, view, False)
+        if color is not None:
+            print(f"[Eyedropper] Picked {color.name()}")
 
     def mouse_move_event(self, event, scene, view=None):
-        pass
+        if self.picking:
+            self._pick(event, scene, view, False)
 
     def mouse_release_event(self, event, scene, view=None):
-        pass
+        if not self.picking:
+            return
+        self.picking = False
+        self._pick(event, scene, view, True)
@@ -40,20 +40,32 @@ class EraserTool(BaseTool):
         return "eraser"
 
     def mouse_press_event(self, event, scene, view=None):
-        """Start a new erase stroke - capture initial canvas state."""
+        """Start a new erase stroke on the canvas."""
+        from PyQt5.QtGui import QPainter, QPen
+        from src.core.stroke_engine import StrokeEngine
+        from src.core.item_registry import ItemRole
         
         if view:
             pos = view.mapToScene(event.pos())
         else:
             pos = event.pos()
         
-        self.last_pos = pos
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if not canvas_item:
+            return
+        
+        pen = QPen(Qt.black)
+        pen.setWidth(self.size_spin.value())
+        pen.setCapStyle(Qt.RoundCap)
+        pen.setJoinStyle(Qt.RoundJoin)
         
-        self.before_image = None
+        self.stroke = StrokeEngine()
+        self.stroke.begin(canvas_item, pos, pen,
+                          composition_mode=QPainter.CompositionMode_Clear)
 
     def mouse_move_event(self, event, scene, view=None):
-        """Continue the erase stroke - draw white directly to canvas pixels."""
-        if not hasattr(self, 'last_pos') or self.last_pos is None:
+        """Continue the erase stroke - clear the new segment from the canvas."""
+        if not hasattr(self, 'stroke') or not self.stroke.is_active():
             return
             
         if view:
@@ -61,70 +73,30 @@ class EraserTool(BaseTool):
         else:
             current_pos = event.pos()
         
-        from PyQt5.QtGui import QPainter, QPen
-        
-        canvas_item = None
-        for item in scene.items():
-            if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                canvas_item = item
-                break
-        
-        if not canvas_item:
+        self.stroke.add_points([current_pos])
+
+    def mouse_move_batch_event(self, events, scene, view=None):
+        """Continue the stroke through every coalesced move event at once."""
+        if not hasattr(self, 'stroke') or not self.stroke.is_active():
             return
         
-        if self.before_image is None:
-            self.before_image = canvas_item.pixmap().toImage().copy()
-        
-        pixmap = canvas_item.pixmap()
-        painter = QPainter(pixmap)
-        
-        size = self.size_spin.value()
-        
-        painter.setCompositionMode(QPainter.CompositionMode_Clear)
-        
-        pen = QPen(Qt.black)
-        pen.setWidth(size)
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setJoinStyle(Qt.RoundJoin)
-        
-        painter.setPen(pen)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        painter.drawLine(self.last_pos, current_pos)
-        
-        painter.end()
-        
-        canvas_item.setPixmap(pixmap)
+        if view:
+            points = [view.mapToScene(event.pos()) for event in events]
+        else:
+            points = [event.pos() for event in events]
         
-        self.last_pos = current_pos
+        self.stroke.add_points(points)
 
     def mouse_release_event(self, event, scene, view=None):
         """Finish the erase stroke and create a command."""
         from src.commands.pixel_draw_command import PixelDrawCommand
         
-        if hasattr(self, 'before_image') and self.before_image is not None:
-            canvas_item = None
-            for item in scene.items():
-                if hasattr(item, 'pixmap') and item.data(0) == 'canvas':
-                    canvas_item = item
-                    break
-            
-            if canvas_item:
-                after_image = canvas_item.pixmap().toImage().copy()
-                
-                command = PixelDrawCommand(
-                    self.before_image,
-                    after_image,
-                    "Eraser Stroke"
-                )
-                
-                self.before_image = None
-                self.last_pos = None
-                
-                return command
+        if not hasattr(self, 'stroke'):
+            return None
         
-        self.before_image = None
-        self.last_pos = None
+        result = self.stroke.end()
+        if result is None:
+            return None
         
-        return None
-
+        rect, before_patch, after_patch = result
+        return PixelDrawCommand(rect, before_patch, after_patch, "Eraser Stroke")
@@ -1,10 +1,17 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QComboBox, QAction)
+from PyQt5.QtCore import QRectF, QLineF, QPointF
+from PyQt5.QtGui import QPainterPath, QPolygonF
 from src.core.base_tool import BaseTool
+from src.core.item_registry import ItemRole
+from src.core.selection import Selection
 
 
 class SelectionTool(BaseTool):
     def __init__(self):
         super().__init__("Selection", None)
+        self.start_pos = None
+        self.points = []
+        self.moving_objects = False
 
     def create_action(self) -> QAction:
         self._action = QAction(self.name)
@@ -16,10 +23,15 @@ class SelectionTool(BaseTool):
         layout = QVBoxLayout(selection_widget)
 
         self.selection_mode_combo = QComboBox()
-        self.selection_mode_combo.addItems(["Rectangle", "Ellipse", "Lasso", "Magic Wand"])
+        self.selection_mode_combo.addItems(["Rectangle", "Ellipse", "Lasso", "Magic Wand", "Objects"])
+
+        info_label = QLabel("Filters only change the selected area. Click without dragging to select everything.\n"
+                            "Objects mode selects shapes and text; drag a selected one to move them all.")
+        info_label.setWordWrap(True)
 
         layout.addWidget(QLabel("Selection Mode:"))
         layout.addWidget(self.selection_mode_combo)
+        layout.addWidget(info_label)
         layout.addStretch()
 
         self._settings_widget = selection_widget
@@ -28,15 +40,104 @@ class SelectionTool(BaseTool):
     def get_tool_name(self) -> str:
         return "selection"
 
+    def _scene_pos(self, event, view):
+        return view.mapToScene(event.pos()) if view else event.pos()
+
+    def _outline(self, end_pos):
+        """Get the outline being dragged as a QPainterPath."""
+        mode = self.selection_mode_combo.currentText()
+        path = QPainterPath()
+        if mode == "Lasso":
+            path.addPolygon(QPolygonF(self.points + [end_pos]))
+            path.closeSubpath()
+        elif mode == "Ellipse":
+            path.addEllipse(QRectF(self.start_pos, end_pos).normalized())
+        else:
+            path.addRect(QRectF(self.start_pos, end_pos).normalized())
+        return path
+
     def mouse_press_event(self, event, scene, view=None):
         mode = self.selection_mode_combo.currentText()
-        pos = event.pos()
-        print(f"[SelectionTool] Mouse pressed at ({pos.x()}, {pos.y()}) - Mode: {mode}")
+        if mode == "Magic Wand":
+            print("[SelectionTool] Magic Wand selection is not supported yet")
+            return
+
+        pos = self._scene_pos(event, view)
+        self.start_pos = pos
+        self.points = [pos]
+        if mode == "Objects":
+            vectors = scene.vectors
+            vectors.select(vectors.selected)  # Drop items undone since they were selected
+            self.moving_objects = vectors.item_at(pos) in vectors.selected
+        else:
+            scene.set_selection(None)
+        print(f"[SelectionTool] Mouse pressed at ({pos.x():.1f}, {pos.y():.1f}) - Mode: {mode}")
 
     def mouse_move_event(self, event, scene, view=None):
-        pos = event.pos()
-        print(f"[SelectionTool] Mouse moved to ({pos.x()}, {pos.y()})")
+        if self.start_pos is None:
+            return
+        self.mouse_move_batch_event([event], scene, view)
+
+    def mouse_move_batch_event(self, events, scene, view=None):
+        """Only the outline follows the mouse; the mask is built on release."""
+        if self.start_pos is None:
+            return
+        if self.moving_objects:
+            scene.vectors.show_drag_offset(self._scene_pos(events[-1], view) - self.start_pos)
+            return
+        if self.selection_mode_combo.currentText() == "Lasso":
+            self.points.extend(self._scene_pos(event, view) for event in events)
+        scene.show_selection_outline(self._outline(self._scene_pos(events[-1], view)))
 
     def mouse_release_event(self, event, scene, view=None):
-        pos = event.pos()
-        print(f"[SelectionTool] Mouse released at ({pos.x()}, {pos.y()})")
+        if self.start_pos is None:
+            return
+        pos = self._scene_pos(event, view)
+        if self.selection_mode_combo.currentText() == "Objects":
+            return self._release_objects(scene, pos)
+        path = self._outline(pos)
+        self.start_pos = None
+        self.points = []
+
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if canvas_item is None:
+            return
+        bounds = path.boundingRect()
+        if bounds.width() < 1 or bounds.height() < 1:
+            scene.set_selection(None)  # A click selects everything again
+        else:
+            scene.set_selection(Selection(path, canvas_item.image().rect()))
+
+        if scene.selection is None:
+            print("[SelectionTool] Selection cleared")
+        else:
+            rect = scene.selection.rect
+            print(f"[SelectionTool] Selected {rect.width()}x{rect.height()} at ({rect.x()}, {rect.y()})")
+
+    def _release_objects(self, scene, pos):
+        """Move the dragged objects, or select the objects under the click or drag."""
+        from src.commands.move_items_command import MoveItemsCommand
+
+        start = self.start_pos
+        self.start_pos = None
+        self.points = []
+        vectors = scene.vectors
+        dragged = QLineF(start, pos).length() >= 1
+
+        if self.moving_objects:
+            self.moving_objects = False
+            vectors.show_drag_offset(QPointF())
+            if dragged:
+                print(f"[SelectionTool] Moved {len(vectors.selected)} objects")
+                return MoveItemsCommand(vectors.selected, pos - start)
+            return None
+
+        # The rubber band borrowed the outline of the pixel selection
+        scene.show_selection_outline(scene.selection.path if scene.selection is not None else None)
+        if dragged:
+            vectors.select(vectors.items_in(QRectF(start, pos).normalized()))
+        else:
+            item = vectors.item_at(pos)
+            vectors.select([item] if item is not None else [])
+        print(f"[SelectionTool] Selected {len(vectors.selected)} objects")
+        return None
@@ -1,6 +1,17 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSpinBox,
-                             QPushButton, QGroupBox, QComboBox, QAction)
+                             QPushButton, QGroupBox, QComboBox, QAction, QCheckBox,
+                             QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsLineItem)
+from PyQt5 import sip
+from PyQt5.QtCore import Qt, QLineF
+from PyQt5.QtGui import QPen, QBrush, QPainter
 from src.core.base_tool import BaseTool
+from src.core.item_registry import ItemRole
+
+SHAPE_ITEM_TYPES = {
+    "rectangle": QGraphicsRectItem,
+    "circle": QGraphicsEllipseItem,
+    "line": QGraphicsLineItem,
+}
 
 
 class ShapeTool(BaseTool):
@@ -14,6 +25,8 @@ class ShapeTool(BaseTool):
         self.shape_type = shape_type
         self.color_callback = color_callback
         self.current_color = current_color
+        self.start_pos = None
+        self.preview_item = None  # Reused for every drag; only its geometry changes
 
     def create_action(self) -> QAction:
         self._action = QAction(self.name)
@@ -35,8 +48,13 @@ class ShapeTool(BaseTool):
 
         layout.addWidget(QLabel("Draw Mode:"))
         layout.addWidget(self.fill_combo)
+        self.rasterize_checkbox = QCheckBox("Paint into canvas")
+        self.rasterize_checkbox.setToolTip("Rasterize finished shapes instead of keeping them as scene items")
+        self.rasterize_checkbox.setChecked(True)
+
         layout.addWidget(width_label)
         layout.addWidget(self.width_spin)
+        layout.addWidget(self.rasterize_checkbox)
         layout.addStretch()
 
         self._settings_widget = shape_widget
@@ -48,15 +66,100 @@ class ShapeTool(BaseTool):
     def needs_color(self) -> bool:
         return True
 
+    def _pen_and_brush(self):
+        color = self.current_color if self.current_color is not None else Qt.black
+        mode = self.fill_combo.currentText()
+        pen = QPen(color, self.width_spin.value())
+        pen.setJoinStyle(Qt.MiterJoin if self.shape_type == "rectangle" else Qt.RoundJoin)
+        pen.setCapStyle(Qt.RoundCap)
+        if mode == "Fill Only" and self.shape_type != "line":
+            pen = QPen(Qt.NoPen)
+        brush = QBrush(color) if mode != "Stroke Only" and self.shape_type != "line" else QBrush(Qt.NoBrush)
+        return pen, brush
+
+    def _set_geometry(self, item, start, end):
+        """Move a shape item to span from start to end."""
+        if self.shape_type == "line":
+            item.setLine(start.x(), start.y(), end.x(), end.y())
+        else:
+            item.setRect(min(start.x(), end.x()), min(start.y(), end.y()),
+                         abs(end.x() - start.x()), abs(end.y() - start.y()))
+
     def mouse_press_event(self, event, scene, view=None):
-        pos = event.pos()
+        """Start a rubber-band preview of the shape."""
+        pos = view.mapToScene(event.pos()) if view else event.pos()
+        self.start_pos = pos
+
+        # Clearing the scene for a new document deletes the item with it
+        if self.preview_item is None or sip.isdeleted(self.preview_item):
+            self.preview_item = SHAPE_ITEM_TYPES[self.shape_type]()
+            self.preview_item.setZValue(1e5)  # Above finished shapes while dragging
+        pen, brush = self._pen_and_brush()
+        self.preview_item.setPen(pen)
+        if self.shape_type != "line":
+            self.preview_item.setBrush(brush)
+        self._set_geometry(self.preview_item, pos, pos)
+        scene.registry.register(ItemRole.SHAPE_PREVIEW, self.preview_item)
+        scene.addItem(self.preview_item)
+
         mode = self.fill_combo.currentText()
-        print(f"[{self.shape_type.capitalize()}] Mouse pressed at ({pos.x()}, {pos.y()}) - Mode: {mode}")
+        print(f"[{self.shape_type.capitalize()}] Mouse pressed at ({pos.x():.1f}, {pos.y():.1f}) - Mode: {mode}")
 
     def mouse_move_event(self, event, scene, view=None):
-        pos = event.pos()
-        print(f"[{self.shape_type.capitalize()}] Drawing shape to ({pos.x()}, {pos.y()})")
+        if self.start_pos is None:
+            return
+        pos = view.mapToScene(event.pos()) if view else event.pos()
+        self._set_geometry(self.preview_item, self.start_pos, pos)
 
     def mouse_release_event(self, event, scene, view=None):
-        pos = event.pos()
-        print(f"[{self.shape_type.capitalize()}] Shape completed at ({pos.x()}, {pos.y()})")
+        """Finish the shape as a canvas patch or as a scene item."""
+        from src.commands.pixel_draw_command import PixelDrawCommand
+        from src.commands.shape_command import ShapeCommand
+
+        if self.start_pos is None:
+            return None
+        start = self.start_pos
+        end = view.mapToScene(event.pos()) if view else event.pos()
+        self.start_pos = None
+
+        scene.registry.unregister(ItemRole.SHAPE_PREVIEW)
+        if self.preview_item.scene() is scene:
+            scene.removeItem(self.preview_item)
+
+        if QLineF(start, end).length() < 1:
+            return None
+        print(f"[{self.shape_type.capitalize()}] Shape completed at ({end.x():.1f}, {end.y():.1f})")
+
+        pen, brush = self._pen_and_brush()
+        name = self.name.split("/")[0]
+        if not self.rasterize_checkbox.isChecked():
+            item = SHAPE_ITEM_TYPES[self.shape_type]()
+            item.setPen(pen)
+            if self.shape_type != "line":
+                item.setBrush(brush)
+            self._set_geometry(item, start, end)
+            return ShapeCommand(item, name)
+
+        canvas_item = scene.registry.get(ItemRole.CANVAS)
+        if canvas_item is None:
+            return None
+        self._set_geometry(self.preview_item, start, end)
+        rect = self.preview_item.boundingRect().toAlignedRect().intersected(canvas_item.image().rect())
+        if rect.isEmpty():
+            return None
+
+        before_patch = canvas_item.image().copy(rect)
+        painter = QPainter(canvas_item.image())
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(pen)
+        painter.setBrush(brush)
+        if self.shape_type == "line":
+            painter.drawLine(QLineF(start, end))
+        elif self.shape_type == "circle":
+            painter.drawEllipse(self.preview_item.rect())
+        else:
+            painter.drawRect(self.preview_item.rect())
+        painter.end()
+        canvas_item.mark_dirty(rect)
+
+        return PixelDrawCommand(rect, before_patch, canvas_item.image().copy(rect), f"Draw {name}")
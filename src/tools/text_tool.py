@@ -1,13 +1,31 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSpinBox,
                              QPushButton, QGroupBox, QComboBox, QAction)
+from PyQt5 import sip
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QColor
 from src.core.base_tool import BaseTool
+from src.core.item_registry import ItemRole
+from src.core.text_item import EditableTextItem
 
 
 class TextTool(BaseTool):
-    def __init__(self, color_callback=None, current_color=None):
+    def __init__(self, color_callback=None, current_color=None, command_callback=None):
+        """
+        Initialize text tool.
+
+        Args:
+            color_callback: Called to choose a color
+            current_color: Initial text color
+            command_callback: Called with the command recording an editing
+                session when the session ends
+        """
         super().__init__("Text", None)
         self.color_callback = color_callback
         self.current_color = current_color
+        self.command_callback = command_callback
+        self.editing = None  # EditableTextItem being edited
+        self.editing_new = False  # The item is not in the history yet
+        self.scene = None
 
     def create_action(self) -> QAction:
         self._action = QAction(self.name)
@@ -42,11 +60,64 @@ class TextTool(BaseTool):
     def needs_color(self) -> bool:
         return True
 
+    def on_tool_deselected(self):
+        self.finish_editing()
+        super().on_tool_deselected()
+
+    def _begin_editing(self, item, scene, new):
+        # Registered under its own role while edited, so the item is neither
+        # flattened nor picked up as a selectable object mid-edit
+        scene.registry.register(ItemRole.TEXT_EDIT, item)
+        self.editing = item
+        self.editing_new = new
+        self.scene = scene
+        item.begin_edit()
+
+    def finish_editing(self):
+        """End the editing session and hand its command to command_callback."""
+        from src.commands.text_command import TextCommand
+        from src.commands.text_edit_command import TextEditCommand
+
+        item, scene = self.editing, self.scene
+        self.editing = None
+        self.scene = None
+        if item is None or sip.isdeleted(item):
+            return  # The scene was cleared for another document
+
+        scene.registry.unregister(ItemRole.TEXT_EDIT)
+        item.setData(0, None)
+        change = item.end_edit()
+        if self.editing_new:
+            # A new item joins the history once, with everything typed into it
+            scene.vectors.remove(item)
+            command = TextCommand(item) if item.toPlainText() else None
+        else:
+            command = TextEditCommand(item, *change) if change else None
+
+        if command is not None and self.command_callback:
+            self.command_callback(command)
+
     def mouse_press_event(self, event, scene, view=None):
-        pos = event.pos()
-        font = self.font_combo.currentText()
-        size = self.size_spin.value()
-        print(f"[Text] Clicked at ({pos.x()}, {pos.y()}) - Font: {font}, Size: {size}")
+        """Start editing the text under the click, or a new text there."""
+        pos = view.mapToScene(event.pos()) if view else event.pos()
+        if self.editing is not None and self.editing.sceneBoundingRect().contains(pos):
+            return  # The item itself moves the cursor
+
+        self.finish_editing()
+        # item_at() also checks texts baked into the flattened layer and puts
+        # them back, so clicking one edits it instead of starting a new text
+        item = scene.vectors.item_at(pos)
+        if isinstance(item, EditableTextItem):
+            self._begin_editing(item, scene, new=False)
+            return
+
+        font = QFont(self.font_combo.currentText(), self.size_spin.value())
+        color = QColor(self.current_color) if self.current_color is not None else QColor(Qt.black)
+        item = EditableTextItem("", font, color)
+        item.setPos(pos)
+        scene.vectors.add(item)
+        self._begin_editing(item, scene, new=True)
+        print(f"[Text] New text at ({pos.x():.1f}, {pos.y():.1f}) - Font: {font.family()}, Size: {font.pointSize()}")
 
     def mouse_move_event(self, event, scene, view=None):
         pass
@@ -1,11 +1,17 @@
+import time
+
 from PyQt5.QtWidgets import QGraphicsView
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPainter, QBrush, QColor
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QBrush, QColor, QMouseEvent
 
 
 class CanvasView(QGraphicsView):
     """Custom QGraphicsView that forwards mouse events to active tool"""
 
+    FRAME_INTERVAL_MS = 16  # Mouse moves are coalesced and delivered once per frame
+
+    view_changed = pyqtSignal()  # The zoom or the viewport size changed
+
     def __init__(self, document, orchestrator):
         super().__init__(document.scene)
         self.document = document
@@ -38,6 +44,12 @@ class CanvasView(QGraphicsView):
         self.canvas_rect = canvas_rect
         self.max_zoom = 9.0  # Max zoom: each pixel appears as 9 screen pixels
         self.min_zoom = 0.1  # Will be recalculated in resizeEvent
+        
+        self._pending_moves = []
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._move_timer.timeout.connect(self.flush_pending_moves)
     
     def reset_zoom_tracking(self):
         """Reset zoom tracking to 1.0 - call this after resetTransform or fitInView."""
@@ -57,18 +69,39 @@ class CanvasView(QGraphicsView):
             
             self.min_zoom = max(0.01, self.min_zoom)
 
+        self.view_changed.emit()
+
+    def paintEvent(self, event):
+        """Paint the scene and report how long it took to the document."""
+        start = time.perf_counter()
+        super().paintEvent(event)
+        self.document.record_render_time((time.perf_counter() - start) * 1000.0)
+
+    def flush_pending_moves(self):
+        """Deliver coalesced mouse moves to the orchestrator in one batch."""
+        self._move_timer.stop()
+        if not self._pending_moves:
+            return
+        events = self._pending_moves
+        self._pending_moves = []
+        self.orchestrator.handle_mouse_move_batch(events, self.document.scene, self)
+
     def mousePressEvent(self, event):
         """Forward mouse press to orchestrator"""
+        self.flush_pending_moves()
         self.orchestrator.handle_mouse_press(event, self.document.scene, self)
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
-        """Forward mouse move to orchestrator"""
-        self.orchestrator.handle_mouse_move(event, self.document.scene, self)
+        """Queue mouse move for the orchestrator; moves are delivered once per frame"""
+        self._pending_moves.append(QMouseEvent(event))
+        if not self._move_timer.isActive():
+            self._move_timer.start()
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
         """Forward mouse release to orchestrator and execute command if returned"""
+        self.flush_pending_moves()
         command = self.orchestrator.handle_mouse_release(event, self.document.scene, self)
         if command:
             self.document.execute_command(command)
@@ -122,13 +122,22 @@ class ColorPickerWidget(QWidget):
             self.content_widget.setVisible(True)
             self.toggle_btn.setText("▼ Hide")
 
-    def set_color(self, color):
+    def set_color(self, color, remember=True):
+        """
+        Make a color current and notify the color change callback.
+
+        Args:
+            color: New current color
+            remember: Whether to add it to the recent colors; False for
+                intermediate colors, e.g. while the eyedropper is dragged
+        """
         self.current_color = color
         self.main_color_button.setStyleSheet(
             f"QPushButton {{ background-color: {color.name()}; border: 2px solid #666; }}"
         )
         self.main_color_button.update()
-        self.add_to_recent_colors(color)
+        if remember:
+            self.add_to_recent_colors(color)
         if self.color_change_callback:
             self.color_change_callback(color)
 
@@ -0,0 +1,98 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QGroupBox, QListWidget)
+
+
+class FilterChainWidget(QWidget):
+    """
+    Collects point-operation filters into a chain applied in one pass.
+
+    Each entry captures the filter's settings when it is added, so the
+    same filter can appear several times with different values.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []  # (filter name, PointOperation, settings tuple)
+        self.current_filter = None
+        self.apply_callback = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        group = QGroupBox("Adjustment Chain")
+        group_layout = QVBoxLayout(group)
+
+        self.entry_list = QListWidget()
+        self.entry_list.setMaximumHeight(100)
+
+        self.add_btn = QPushButton("Add Current Filter")
+        self.add_btn.setToolTip("Add the selected adjustment with its current settings")
+        self.add_btn.setEnabled(False)
+        self.add_btn.clicked.connect(self.add_current_filter)
+
+        button_layout = QHBoxLayout()
+        self.apply_btn = QPushButton("Apply Chain")
+        self.apply_btn.setEnabled(False)
+        self.apply_btn.clicked.connect(self.apply_chain)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+        button_layout.addWidget(self.apply_btn)
+        button_layout.addWidget(clear_btn)
+
+        group_layout.addWidget(QLabel("Point adjustments run in a single pass."))
+        group_layout.addWidget(self.entry_list)
+        group_layout.addWidget(self.add_btn)
+        group_layout.addLayout(button_layout)
+
+        main_layout.addWidget(group)
+
+    def set_current_filter(self, filter_obj):
+        """Track the selected filter; only point operations can be added."""
+        self.current_filter = filter_obj
+        self.add_btn.setEnabled(filter_obj is not None and filter_obj.get_point_operation() is not None)
+
+    def add_current_filter(self):
+        if self.current_filter is None:
+            return
+        operation = self.current_filter.get_point_operation()
+        if operation is None:
+            return
+        self.entries.append((self.current_filter.name, operation,
+                             self.current_filter.get_parameters()))
+        self.entry_list.addItem(self.current_filter.name)
+        self.apply_btn.setEnabled(True)
+
+    def get_operation(self):
+        """
+        Compose the chain into a single operation.
+
+        Returns:
+            PointOperation or None if the chain is empty
+        """
+        if not self.entries:
+            return None
+        operation = self.entries[0][1]
+        for _, next_operation, _ in self.entries[1:]:
+            operation = operation.then(next_operation)
+        return operation
+
+    def get_chain_name(self) -> str:
+        return " + ".join(name for name, _, _ in self.entries)
+
+    def get_parameters(self) -> tuple:
+        """Get the settings of every entry, in chain order."""
+        return tuple(parameters for _, _, parameters in self.entries)
+
+    def apply_chain(self):
+        if self.entries and self.apply_callback:
+            self.apply_callback(self.get_operation(), self.get_chain_name())
+
+    def clear(self):
+        self.entries = []
+        self.entry_list.clear()
+        self.apply_btn.setEnabled(False)
+
+    def set_apply_callback(self, callback):
+        self.apply_callback = callback
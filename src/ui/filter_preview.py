@@ -0,0 +1,169 @@
+"""
+Live filter preview on a viewport-resolution proxy.
+
+Changing a filter setting restarts a short debounce timer. When the timer
+fires, only the part of the image visible in the view is composited at
+screen resolution, filtered with BaseFilter.apply_preview() and shown in
+an overlay on top of the canvas. The cost depends on the size of the
+viewport, not of the document. Apply still runs the full-resolution
+FilterCommand. Previews are kept in the document's filter cache, so going
+back to earlier settings or re-enabling a preview shows it immediately.
+With a selection, pixels outside it are shown unfiltered.
+"""
+
+from PyQt5 import sip
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsPixmapItem, QSlider, QComboBox, QCheckBox
+from PyQt5.QtCore import Qt, QObject, QTimer, QSize, QRectF
+from PyQt5.QtGui import QPixmap, QTransform, QImage, QPainter, QPainterPath
+
+
+class FilterPreview(QObject):
+    """Shows a debounced preview of the selected filter's current settings."""
+
+    DEBOUNCE_MS = 50
+
+    def __init__(self, view, document):
+        """
+        Initialize filter preview.
+
+        Args:
+            view: QGraphicsView showing the document
+            document: Document whose canvas is previewed
+        """
+        super().__init__(view)
+        self.view = view
+        self.document = document
+        self.filter_obj = None
+        self._item = None
+        self._hidden_items = []  # Raster items faded out while the preview covers them
+        self._watched = set()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        view.horizontalScrollBar().valueChanged.connect(self.invalidate)
+        view.verticalScrollBar().valueChanged.connect(self.invalidate)
+        # Zooming out or enlarging the window exposes canvas the overlay
+        # does not cover, and the canvas under it is faded out
+        view.view_changed.connect(self.invalidate)
+
+    def watch(self, filter_obj):
+        """
+        Schedule a preview whenever one of a filter's settings changes.
+
+        Args:
+            filter_obj: Filter whose settings widget has been created
+        """
+        name = filter_obj.get_filter_name()
+        widget = filter_obj.get_settings_widget()
+        if name in self._watched or widget is None:
+            return
+
+        request = lambda *args, f=filter_obj: self.request(f)
+        for slider in widget.findChildren(QSlider):
+            slider.valueChanged.connect(request)
+        for combo in widget.findChildren(QComboBox):
+            combo.currentIndexChanged.connect(request)
+        for checkbox in widget.findChildren(QCheckBox):
+            checkbox.toggled.connect(request)
+        self._watched.add(name)
+
+    def request(self, filter_obj):
+        """Preview a filter once its settings stop changing."""
+        self.filter_obj = filter_obj
+        self._timer.start()
+
+    def invalidate(self):
+        """Recompute an active preview, e.g. after scrolling, zooming or undo."""
+        if self.filter_obj is not None:
+            self._timer.start()
+
+    def cancel(self):
+        """Stop previewing and show the real canvas again."""
+        self._timer.stop()
+        self.filter_obj = None
+        self._remove_overlay()
+
+    def refresh(self):
+        """Filter the visible region at screen resolution and show the result."""
+        canvas_item = self.document.canvas_item
+        if self.filter_obj is None or canvas_item is None:
+            return
+
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        region = visible.toAlignedRect().intersected(canvas_item.image().rect())
+        if region.isEmpty():
+            self._remove_overlay()
+            return
+
+        scale = min(1.0, self.view.transform().m11())
+        size = QSize(max(1, round(region.width() * scale)), max(1, round(region.height() * scale)))
+        selection = self.document.selection
+        cache = self.document.filter_cache
+        key = cache.make_key(self.document.revision, self.filter_obj.get_filter_name(),
+                             self.filter_obj.get_parameters(),
+                             ('preview', region.getRect(), (size.width(), size.height()),
+                              selection.serial if selection is not None else None))
+        result = cache.get(key)
+        if result is None:
+            proxy = self.document.render_raster(region, size)
+            result = self.filter_obj.apply_preview(proxy.copy(), size.width() / region.width())
+            if result is None:
+                return
+            if selection is not None:
+                result = self._restore_unselected(result, proxy, selection.path, region)
+            cache.put(key, result)
+
+        item = self._overlay(canvas_item)
+        item.setPixmap(QPixmap.fromImage(result))
+        item.setPos(region.topLeft())
+        item.setTransform(QTransform.fromScale(region.width() / size.width(),
+                                               region.height() / size.height()))
+
+    def _restore_unselected(self, result, proxy, selection_path, region):
+        """Paint the unfiltered proxy back over everything outside the selection."""
+        outside = QPainterPath()
+        outside.addRect(QRectF(region))
+        outside = outside.subtracted(selection_path)
+
+        result = result.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        painter = QPainter(result)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.scale(result.width() / region.width(), result.height() / region.height())
+        painter.translate(-region.x(), -region.y())
+        painter.setClipPath(outside)
+        painter.drawImage(QRectF(region), proxy)
+        painter.end()
+        return result
+
+    def _overlay(self, canvas_item):
+        """Get the overlay item, creating it on the current canvas if needed."""
+        if self._item is not None and (sip.isdeleted(self._item) or self._item.parentItem() is not canvas_item):
+            self._remove_overlay()
+
+        if self._item is None:
+            # The overlay is a child of the canvas so it keeps the canvas's
+            # place below shape/text items; the raster items underneath are
+            # faded out because the preview already contains their pixels.
+            self._item = QGraphicsPixmapItem(canvas_item)
+            self._item.setFlag(QGraphicsItem.ItemIgnoresParentOpacity, True)
+            self._item.setTransformationMode(Qt.SmoothTransformation)
+            self._hidden_items = [item for item in (self.document.background_item, canvas_item)
+                                  if item is not None]
+            for item in self._hidden_items:
+                item.setOpacity(0.0)
+        return self._item
+
+    def _remove_overlay(self):
+        for item in self._hidden_items:
+            if not sip.isdeleted(item):
+                item.setOpacity(1.0)
+        self._hidden_items = []
+
+        if self._item is not None and not sip.isdeleted(self._item):
+            scene = self._item.scene()
+            if scene is not None:
+                scene.removeItem(self._item)
+        self._item = None